@@ -0,0 +1,118 @@
+"""Solve an EPD test suite ("bm" / "am" opcodes) with a bot, spreading positions over processes.
+
+    python benchmarks/epd_suite.py benchmarks/data/sample.epd --depth 3
+    python benchmarks/epd_suite.py suite.epd --time-ms 1000 --depth 0 --workers 8 --verbose
+    python benchmarks/epd_suite.py benchmarks/data/sample.epd --backend bitboard
+"""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state.epd import parse_epd
+from bot.registry import get_bot, bot_names
+
+# error: thong bao loi neu ban ghi EPD hong (FEN / nuoc bm, am khong hop le), None neu chay duoc
+EpdResult = namedtuple("EpdResult", ["index", "id", "solved", "move", "expected", "nodes", "elapsed", "error"],
+                       defaults=[None])
+
+def make_bot(name, depth, time_ms, tt_mb, backend="board"):
+    if name == "minimax":
+        return get_bot(name, depth=depth or None, time_limit_ms=time_ms, tt_size_mb=tt_mb, backend=backend)
+    return get_bot(name)
+
+# Moi process giu 1 bot, dung lai cho moi the co no nhan
+_bot = None
+
+def _init_worker(bot_args):
+    global _bot
+    _bot = make_bot(*bot_args)
+
+def solve(index, line):
+    """Search one EPD record; a record that cannot be parsed is reported as an error, not raised."""
+    try:
+        return _solve(index, line)
+    except ValueError as e:
+        return EpdResult(index, f"#{index + 1}", False, "-", line, 0, 0.0, str(e))
+
+def _solve(index, line):
+    """Search one EPD record with this process's bot."""
+    board, ops = parse_epd(line)
+    best = {board.parse_san(san) for san in ops.get("bm", [])}
+    avoid = {board.parse_san(san) for san in ops.get("am", [])}
+    if getattr(_bot, "tt", None) is not None:
+        _bot.tt.clear()     # moi the co tinh doc lap, khong dung lai TT cua the co truoc
+
+    start = time.perf_counter()
+    nxt = _bot.choose_move(board)
+    elapsed = time.perf_counter() - start
+
+    move = nxt.move if nxt is not None else None
+    solved = move is not None and (not best or move in best) and move not in avoid
+    info = getattr(_bot, "last_info", None)
+    nodes = info.total_nodes if info is not None else 0
+    expected = " ".join([f"bm {s}" for s in ops.get("bm", [])] + [f"am {s}" for s in ops.get("am", [])])
+    return EpdResult(
+        index,
+        ops.get("id", [f"#{index + 1}"])[0],
+        solved,
+        board.san(move) if move is not None else "-",
+        expected,
+        nodes,
+        elapsed,
+    )
+
+def run_suite(lines, bot_args, workers):
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(bot_args,)) as pool:
+        futures = [pool.submit(solve, i, line) for i, line in enumerate(lines)]
+        return [f.result() for f in futures]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="EPD file")
+    parser.add_argument("--bot", choices=bot_names(), default="minimax")
+    parser.add_argument("--depth", type=int, default=3, help="search depth (0 = unlimited, needs --time-ms)")
+    parser.add_argument("--time-ms", type=int, help="time limit per position")
+    parser.add_argument("--tt-mb", type=int, default=16)
+    parser.add_argument("--backend", choices=["board", "bitboard"], default="board", help="position backend of the minimax search")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--limit", type=int, help="only the first N positions")
+    parser.add_argument("--verbose", action="store_true", help="print one line per position")
+    args = parser.parse_args(argv)
+    if not args.depth and args.time_ms is None:
+        parser.error("--depth 0 needs --time-ms")
+
+    with open(args.path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    if args.limit:
+        lines = lines[:args.limit]
+
+    start = time.perf_counter()
+    results = run_suite(lines, (args.bot, args.depth, args.time_ms, args.tt_mb, args.backend), args.workers)
+    wall = time.perf_counter() - start
+
+    if args.verbose:
+        for r in results:
+            if r.error is not None:
+                print(f"ERR  {r.id:<28} {r.error}")
+                continue
+            status = "OK  " if r.solved else "FAIL"
+            print(f"{status} {r.id:<28} {r.move:<8} ({r.expected})  {r.nodes:>9} nodes  {r.elapsed:6.2f}s")
+    errors = sum(r.error is not None for r in results)
+    if errors:
+        print(f"{errors} record(s) could not be parsed (counted as failed)")
+    solved = sum(r.solved for r in results)
+    nodes = sum(r.nodes for r in results)
+    search_time = sum(r.elapsed for r in results)
+    print(f"Solved {solved}/{len(results)} ({solved / len(results):.1%}) with {args.bot}, {args.workers} workers")
+    print(f"Nodes {nodes}, search time {search_time:.2f}s, wall {wall:.2f}s, "
+          f"nps {nodes / search_time if search_time else 0:.0f} per process, "
+          f"{nodes / wall if wall else 0:.0f} total")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
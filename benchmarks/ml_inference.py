@@ -0,0 +1,68 @@
+"""Latency / throughput of ChessNet on CPU: eager fp32 vs exported (BN folded, TorchScript) vs int8.
+
+    python benchmarks/ml_inference.py --model machine_learning/chess_model.pth --threads 1
+"""
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from machine_learning.model import ChessNet
+from machine_learning.export import load_chessnet, export_model, random_positions, accuracy_drift
+from machine_learning.utils import boards_to_tensor
+
+def time_batch(model, batch, iters, warmup=3):
+    """Seconds per forward pass of `batch`."""
+    with torch.inference_mode():
+        for _ in range(warmup):
+            model(batch)
+        start = time.perf_counter()
+        for _ in range(iters):
+            model(batch)
+    return (time.perf_counter() - start) / iters
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="state_dict from train.py (default: random weights)")
+    parser.add_argument("--batch-sizes", default="1,32,256")
+    parser.add_argument("--iters", type=int, default=50)
+    parser.add_argument("--threads", type=int, help="torch.set_num_threads")
+    parser.add_argument("--check", type=int, default=1024, help="positions for the accuracy-drift check")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.model:
+        reference = load_chessnet(args.model)
+    else:
+        print("No --model given, timing randomly initialised weights")
+        reference = ChessNet().eval()
+
+    variants = {
+        "fp32 eager": reference,
+        "fp32 folded+jit": export_model(reference),
+        "int8 folded+jit": export_model(reference, quantize=True),
+    }
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    boards = random_positions(max(max(batch_sizes), args.check))
+
+    print(f"{torch.get_num_threads()} threads, {args.iters} iterations per batch size")
+    print(f"{'variant':<18} {'batch':>6} {'ms/batch':>10} {'positions/s':>12}")
+    for name, model in variants.items():
+        for size in batch_sizes:
+            batch = boards_to_tensor(boards[:size])
+            seconds = time_batch(model, batch, args.iters)
+            print(f"{name:<18} {size:>6} {seconds * 1000:>10.3f} {size / seconds:>12.0f}")
+
+    print(f"\nAccuracy drift vs fp32 eager ({args.check} positions)")
+    for name, model in list(variants.items())[1:]:
+        drift = accuracy_drift(reference, model, boards[:args.check])
+        print(f"{name:<18} max {drift['max_abs']:.5f}  mean {drift['mean_abs']:.5f}  "
+              f"same move {drift['move_agreement']:.1%}")
+
+if __name__ == "__main__":
+    main()
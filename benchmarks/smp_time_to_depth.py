@@ -0,0 +1,73 @@
+"""Time-to-depth of Minimaxbot's Lazy SMP mode versus worker count.
+
+Every row runs the same algorithm (iterative deepening 1..depth on the shared
+transposition table); with 1 worker there are simply no helper processes.
+
+    python benchmarks/smp_time_to_depth.py --depth 4 --workers 1,2,4,8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state.board import Board
+from bot.minimax_bot import Minimaxbot
+
+def sample_positions(count, plies, seed):
+    """Positions reached by `plies` random legal moves from the start, reproducible by seed."""
+    rng = random.Random(seed)
+    positions = [Board()]
+    while len(positions) < count:
+        board = Board()
+        for _ in range(plies):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+        if board.generate_moves():
+            positions.append(board)
+    return positions
+
+def time_to_depth(workers, positions, depth, tt_size_mb):
+    bot = Minimaxbot(depth=depth, tt_size_mb=tt_size_mb, workers=workers, parallel="lazy_smp")
+    try:
+        # Khoi dong process pool truoc khi do gio
+        bot.choose_move(positions[0])
+        times = []
+        for board in positions:
+            if bot.tt is not None:
+                bot.tt.clear()
+            start = time.perf_counter()
+            bot.choose_move(board)
+            times.append(time.perf_counter() - start)
+        return times
+    finally:
+        bot.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--positions", type=int, default=6)
+    parser.add_argument("--plies", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--tt-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions, args.plies, args.seed)
+    counts = [int(w) for w in args.workers.split(",")]
+    print(f"Depth {args.depth}, {len(positions)} positions, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'total s':>9} {'mean s':>8} {f'vs {counts[0]}w':>8}")
+    baseline = None
+    for workers in counts:
+        times = time_to_depth(workers, positions, args.depth, args.tt_mb)
+        total = sum(times)
+        if baseline is None:
+            baseline = total
+        print(f"{workers:>8} {total:>9.2f} {total / len(times):>8.3f} {baseline / total:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Startup time of the GUI module and machine_learning/evaluate.py, each in a fresh interpreter.
+
+    python benchmarks/startup_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Doan code chay trong process moi: do thoi gian import/tao bot, va xem torch co bi nap khong
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "torch": "torch" in sys.modules}}))
+"""
+
+SCENARIOS = [
+    ("gui: import main", "import main"),
+    ("gui: + Random bot", "import main\nfrom bot.registry import get_bot\nget_bot('random')"),
+    ("gui: + Minimax bot", "import main\nfrom bot.registry import get_bot\nget_bot('minimax')"),
+    ("gui: + ML bot", "import main\nfrom bot.registry import get_bot\nget_bot('ml')"),
+    ("gui: ML bot, 5 resets", "import main\nfrom bot.registry import get_bot\nfor _ in range(5): get_bot('ml')"),
+    ("evaluate: import", "import machine_learning.evaluate"),
+]
+
+def probe(body):
+    """(in-process seconds, process wall seconds, torch loaded) or None if the scenario fails."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(body=body)], cwd=ROOT,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return None
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result["seconds"], wall, result["torch"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} runs")
+    print(f"{'scenario':<24} {'import ms':>10} {'process ms':>11}  torch")
+    for name, body in SCENARIOS:
+        runs = [probe(body) for _ in range(args.runs)]
+        if any(r is None for r in runs):
+            print(f"{name:<24} failed (missing dependency?)")
+            continue
+        inside = statistics.median(r[0] for r in runs) * 1000
+        wall = statistics.median(r[1] for r in runs) * 1000
+        print(f"{name:<24} {inside:>10.1f} {wall:>11.1f}  {'yes' if runs[0][2] else 'no'}")
+
+if __name__ == "__main__":
+    main()
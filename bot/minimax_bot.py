@@ -1,209 +1,535 @@
 import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from bot.bot import Bot
-from state.board import Board, NextState
+from state.board import Board, NextState, GameStatus
+from state.bitboard import BitBoard
+from state.move import pack_move
 from state.piece import PieceType, Color
+# Bang diem uu tien / ma tran diem o tung vi tri nam o state/pst.py de Board cong don diem (board.pst_score);
+# o day chi can gia tri quan cho delta pruning
+from state.pst import PIECE_VALUES
+from bot.transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER
+from bot.move_ordering import MoveOrderer
+from bot.search_info import SearchInfo
 
-#-- BANG DIEM UU TIEN
-
-PIECE_VALUES = {            #Tot 1, Ma 3, Tuong 3, Xe 5, Hau 9
-    PieceType.PAWN: 100, # Quan Tot
-    PieceType.KNIGHT: 300, #Quan Ma
-    PieceType.BISHOP: 350, #Quan Tuong (uu tien hon Ma)
-    PieceType.ROOK: 500,    #Quan Xe
-    PieceType.QUEEN: 900,   #Quan Hau
-    PieceType.KING: 20000   #Quan Tuong
-}
-
-#-- MA TRAN DIEM O TUNG VI TRI
-
-# Quan Tot - tien len, kiem soat trung tam
-PAWN_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [50, 50, 50, 50, 50, 50, 50, 50],
-    [10, 10, 20, 30, 30, 20, 10, 10],
-    [5,  5, 10, 25, 25, 10,  5,  5],
-    [0,  0,  0, 20, 20,  0,  0,  0],
-    [5, -5,-10,  0,  0,-10, -5,  5],
-    [5, 10, 10,-20,-20, 10, 10,  5],
-    [0,  0,  0,  0,  0,  0,  0,  0]
-]
-
-# Quan Ma - tranh o bien
-KNIGHT_TABLE = [
-    [-50,-40,-30,-30,-30,-30,-40,-50],
-    [-40,-20,  0,  0,  0,  0,-20,-40],
-    [-30,  0, 10, 15, 15, 10,  0,-30],
-    [-30,  5, 15, 20, 20, 15,  5,-30],
-    [-30,  0, 15, 20, 20, 15,  0,-30],
-    [-30,  5, 10, 15, 15, 10,  5,-30],
-    [-40,-20,  0,  5,  5,  0,-20,-40],
-    [-50,-40,-30,-30,-30,-30,-40,-50]
-]
-
-# Quan Tuong tranh bien, di o trung tam
-BISHOP_TABLE = [
-    [-20,-10,-10,-10,-10,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5, 10, 10,  5,  0,-10],
-    [-10,  5,  5, 10, 10,  5,  5,-10],
-    [-10,  0, 10, 10, 10, 10,  0,-10],
-    [-10, 10, 10, 10, 10, 10, 10,-10],
-    [-10,  5,  0,  0,  0,  0,  5,-10],
-    [-20,-10,-10,-10,-10,-10,-10,-20]
-]
-
-# Xe: thich hang ngang, o hàng 7
-ROOK_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [5, 10, 10, 10, 10, 10, 10,  5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [0,  0,  0,  5,  5,  0,  0,  0]
-]
-
-# Quan Hau - Tranh o bien
-QUEEN_TABLE = [
-    [-20,-10,-10, -5, -5,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5,  5,  5,  5,  0,-10],
-    [-5,   0,  5,  5,  5,  5,  0, -5],
-    [0,    0,  5,  5,  5,  5,  0, -5],
-    [-10,  5,  5,  5,  5,  5,  0,-10],
-    [-10,  0,  5,  0,  0,  0,  0,-10],
-    [-20,-10,-10, -5, -5,-10,-10,-20]
-]
-
-# Quan Vua - han che di chuyen xa
-KING_MID_TABLE = [
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-20,-30,-30,-40,-40,-30,-30,-20],
-    [-10,-20,-20,-20,-20,-20,-20,-10],
-    [20, 20,  0,  0,  0,  0, 20, 20],
-    [20, 30, 10,  0,  0, 10, 30, 20]
-]
+# Diem so luu trong TT tinh theo goc nhin cua Bot, nen khoa cua Bot Den khac Bot Trang
+BLACK_BOT_KEY = 0x9E3779B97F4A7C15
+
+# So node giua 2 lan kiem tra dong ho
+TIME_CHECK_INTERVAL = 128
+
+# Do sau toi da cua cac process phu Lazy SMP khi khong gioi han do sau
+MAX_HELPER_DEPTH = 64
+
+# Delta pruning: bo qua nuoc an quan neu ca khi an duoc van khong keo noi alpha
+DELTA_MARGIN = 200
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out."""
+
+# ---------- TIM SONG SONG O GOC (process pool) ----------
+# Moi process giu 1 Minimaxbot rieng (TT rieng) va dung chung muc alpha o goc
+_worker_bot = None
+_shared_alpha = None
+
+def _init_root_worker(bot_kwargs, shared_alpha):
+    global _worker_bot, _shared_alpha
+    _worker_bot = Minimaxbot(**bot_kwargs)
+    _shared_alpha = shared_alpha
+
+def _search_root_move(board, move, depth, bot_is_white, deadline):
+    """Search one root move in a worker. Returns (value, counters), value None on timeout."""
+    bot = _worker_bot
+    bot._reset_counters()
+    bot._root_depth = depth
+    bot._deadline = deadline
+    # alpha - 1: nuoc co diem BANG alpha van duoc tinh dung diem, de chon giong het ban tuan tu
+    alpha = _shared_alpha.value - 1
+    board.make_move(move)
+    try:
+        value = bot.minimax(board, depth - 1, alpha, math.inf, False, bot_is_white)
+    except SearchTimeout:
+        return None, bot._counters()
+    finally:
+        bot._deadline = None
+    with _shared_alpha.get_lock():
+        if value > _shared_alpha.value:
+            _shared_alpha.value = value
+    return value, bot._counters()
+
+# ---------- LAZY SMP ----------
+# Cac process phu cung tim tu goc voi do sau / thu tu nuoc khac nhau, chi de lap day TT dung chung
+def _init_smp_worker(bot_kwargs, tt_name, tt_buckets, stop_flag):
+    global _worker_bot
+    _worker_bot = Minimaxbot(**bot_kwargs, tt_size_mb=0)
+    _worker_bot.tt = SharedTranspositionTable(name=tt_name, num_buckets=tt_buckets)
+    _worker_bot._stop = stop_flag
+
+def _smp_helper(board, index, max_depth, deadline):
+    """Iteratively deepen from the root until stopped. Returns nodes searched."""
+    bot = _worker_bot
+    bot._reset_counters()
+    bot.tt.new_search()
+    bot.orderer.new_search()
+    bot_is_white = board.turn == Color.WHITE
+    moves = bot.orderer.order(board, board.generate_moves(), 0)
+    # Lech thu tu nuoc o goc va do sau bat dau de cac process khong tim trung nhau
+    k = index % len(moves)
+    moves = moves[k:] + moves[:k]
+    depth = 1 + index % 2
+    bot._deadline = deadline
+    try:
+        while depth <= max_depth:
+            _, best = bot._search_root(board, moves, depth, bot_is_white)
+            moves.remove(best)
+            moves.insert(0, best)
+            depth += 1
+    except SearchTimeout:
+        pass
+    finally:
+        bot._deadline = None
+    return bot.node_count + bot.qnode_count
 
 class Minimaxbot(Bot):
-    def __init__(self, depth=3): #Depth = 3, theo lượt mình - đối thủ - mình
+    def __init__(self, depth=3, tt_size_mb=16, time_limit_ms=None, quiescence=True, workers=None,
+                 parallel="root", info_callback=None, verbose=False, backend="board"): #Depth = 3, theo lượt mình - đối thủ - mình
+        # time_limit_ms: tim sau dan 1, 2, 3, ... cho toi khi het gio (depth = None: khong gioi han do sau,
+        # neu co depth thi do la do sau toi da)
+        # quiescence: o la (depth = 0) tiep tuc xet cac nuoc an quan cho toi khi the co "yen tinh"
+        # workers: so process tim song song (None = tim tuan tu)
+        # parallel: "root" chia cac nuoc o goc cho cac process,
+        #           "lazy_smp" moi process cung tim tu goc va dung chung TT trong shared memory
+        # info_callback: ham nhan 1 SearchInfo sau moi lan lap sau dan (GUI, script chay khong giao dien)
+        # verbose: in SearchInfo ra man hinh (mac dinh tat)
+        # backend: "board" tim tren ban sao Board, "bitboard" doi the co goc sang BitBoard roi moi tim
+        if depth is None and time_limit_ms is None:
+            raise ValueError("depth=None needs a time_limit_ms")
+        if parallel not in ("root", "lazy_smp"):
+            raise ValueError(f"Unknown parallel mode: {parallel}")
+        if backend not in ("board", "bitboard"):
+            raise ValueError(f"Unknown board backend: {backend}")
         self.depth = depth      
+        self.time_limit_ms = time_limit_ms
+        self.quiescence = quiescence
+        self.workers = workers
+        self.parallel = parallel
+        self.backend = backend
+        self.info_callback = info_callback
+        self.verbose = verbose
+        self.last_info = None   # SearchInfo cua lan lap cuoi cung
+        self._worker_kwargs = {"depth": depth, "quiescence": quiescence}
+        self._pool = None
+        self._shared_alpha = None
+        self._stop = None       # Co dung (process phu Lazy SMP)
+        self._stop_flag = None
+        self.helper_node_count = 0
         self.node_count = 0     #Dem so Node da duyet
+        self.qnode_count = 0    #Dem so Node trong quiescence search
+        self.completed_depth = 0
+        self.seldepth = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self._deadline = None
+        self._root_depth = 0
+        # Sap xep nuoc di: an quan (MVV-LVA), phong cap, killer, history
+        self.orderer = MoveOrderer()
+        # Bang chuyen vi (transposition table), tt_size_mb = 0 de tat
+        self.tt_size_mb = tt_size_mb
+        if self._lazy_smp and not tt_size_mb:
+            raise ValueError("Lazy SMP needs a transposition table (tt_size_mb > 0)")
+        # Lazy SMP: bang trong shared memory chi duoc tao o lan choose_move dau tien
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb and not self._lazy_smp else None
+
+    @property
+    def _lazy_smp(self):
+        # workers=1: cung thuat toan (lap sau dan + TT dung chung) nhung khong co process phu,
+        # lam moc so sanh cho cac so worker khac
+        return self.parallel == "lazy_smp" and bool(self.workers)
 
     def choose_move(self, board: Board) -> NextState:
-        self.node_count = 0
-        print(f"Thinking with depth {self.depth}...")
+        if self._lazy_smp and self.tt is None:
+            self.tt = SharedTranspositionTable(self.tt_size_mb)
+        self._reset_counters()
+        self.helper_node_count = 0
+        self.completed_depth = 0
+        self.last_info = None
+        if self.tt:
+            self.tt.new_search()
+            self.tt.reset_stats()
+        self.orderer.new_search()
+        if self.time_limit_ms is None:
+            # Lazy SMP: process chinh cung lap sau dan de tan dung TT ma cac process phu da lap day
+            depths = range(1, self.depth + 1) if self._lazy_smp else [self.depth]
+        else:
+            depths = range(1, (self.depth or 1000) + 1)
+        start = time.monotonic()
         
         Is_White_Turn = (board.turn == Color.WHITE)
-        
-        best_state = None
     
-        next_states = board.generate_next_states()
+        # Duyet cay tren 1 ban co duy nhat (make/unmake), khong copy moi node
+        if self.backend == "bitboard" and not isinstance(board, BitBoard):
+            root = BitBoard.from_board(board)
+        else:
+            root = board.copy()
+        moves = root.generate_moves()
         
-        if not next_states:
+        if not moves:
             return None             # Het duong di 
 
+        moves = self.orderer.order(root, moves, 0)
+        best_move = moves[0]
+        best_value = -math.inf
+        helpers = []
+        if self._lazy_smp and self.workers > 1:
+            deadline = start + self.time_limit_ms / 1000 if self.time_limit_ms is not None else None
+            helpers = self._start_helpers(root, deadline)
+        for depth in depths:
+            # Lan lap dau tien luon chay xong de chac chan co nuoc di
+            if self.time_limit_ms is not None and depth > 1:
+                self._deadline = start + self.time_limit_ms / 1000
+            try:
+                value, move = self._search_root(root, moves, depth, Is_White_Turn)
+            except SearchTimeout:
+                # Ban co `root` dang do dang giua cay, bo ket qua lan lap nay
+                break
+            finally:
+                self._deadline = None
+            best_value, best_move = value, move
+            self.completed_depth = depth
+            # Nuoc tot nhat cua lan lap truoc duoc tim dau tien o lan lap sau
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            self._report(root, best_value, best_move, depth, Is_White_Turn, start)
+            if self.time_limit_ms is not None and time.monotonic() - start >= self.time_limit_ms / 1000:
+                break
+        if helpers:
+            self._stop_helpers(helpers)
+            if self.last_info is not None:
+                self.last_info.helper_nodes = self.helper_node_count
+        
+        best_board = board.copy()
+        best_board.make_move(best_move)
+        return NextState(board=best_board, move=best_move)
+
+    def _reset_counters(self):
+        self.node_count = 0
+        self.qnode_count = 0
+        self.seldepth = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def _counters(self):
+        return self.node_count, self.qnode_count, self.seldepth, self.cutoffs, self.first_move_cutoffs
+
+    def _add_counters(self, counters):
+        nodes, qnodes, seldepth, cutoffs, first_move_cutoffs = counters
+        self.node_count += nodes
+        self.qnode_count += qnodes
+        self.seldepth = max(self.seldepth, seldepth)
+        self.cutoffs += cutoffs
+        self.first_move_cutoffs += first_move_cutoffs
+
+    def _report(self, board, score, best_move, depth, bot_is_white, start):
+        """Build the SearchInfo for a finished iteration and hand it to the callback / stdout."""
+        info = SearchInfo(
+            depth=depth,
+            seldepth=max(self.seldepth, depth),
+            score=score,
+            nodes=self.node_count,
+            qnodes=self.qnode_count,
+            elapsed=time.monotonic() - start,
+            pv=self.principal_variation(board, best_move, depth, bot_is_white),
+            tt_hit_rate=self.tt.hit_rate() if self.tt else 0.0,
+            cutoffs=self.cutoffs,
+            first_move_cutoffs=self.first_move_cutoffs,
+        )
+        self.last_info = info
+        if self.verbose:
+            print(info)
+        if self.info_callback is not None:
+            self.info_callback(info)
+
+    def principal_variation(self, board, best_move, depth, bot_is_white):
+        """Best line from the root: `best_move`, then the hash moves stored in the TT."""
+        pv = [best_move]
+        if not self.tt:
+            return pv
+        # Tra TT o day khong tinh vao thong ke hit/miss cua lan tim
+        hits, misses = self.tt.hits, self.tt.misses
+        undos = [board.make_move(best_move)]
+        seen = {board.hash}
+        # Chi di theo nuoc trong TT neu no hop le (tranh va cham khoa) va khong lap vi tri
+        while len(pv) < depth:
+            key = board.hash if bot_is_white else board.hash ^ BLACK_BOT_KEY
+            entry = self.tt.probe(key)
+            if entry is None or not entry.move:
+                break
+            move = next((m for m in board.generate_moves() if pack_move(m) == entry.move), None)
+            if move is None:
+                break
+            pv.append(move)
+            undos.append(board.make_move(move))
+            if board.hash in seen:
+                break
+            seen.add(board.hash)
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+        self.tt.hits, self.tt.misses = hits, misses
+        return pv
+
+    def close(self):
+        """Shut down worker processes and free the shared transposition table, if any.
+
+        The bot stays usable: the next `choose_move` starts them again.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+            self.tt = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # Bot bi bo ma khong goi close(): van dung process pool va giai phong shared memory
+        if getattr(self, "tt", None) is not None or getattr(self, "_pool", None) is not None:
+            self.close()
+
+    def _start_helpers(self, board, deadline):
+        if self._pool is None:
+            self._stop_flag = multiprocessing.RawValue('b', 0)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers - 1,
+                initializer=_init_smp_worker,
+                initargs=(self._worker_kwargs, self.tt.name, self.tt.num_buckets, self._stop_flag),
+            )
+        self._stop_flag.value = 0
+        max_depth = (self.depth or MAX_HELPER_DEPTH) + 1
+        # Pool pickle tham so sau (o thread rieng) trong khi process chinh da make/unmake tren `board`,
+        # nen gui 1 ban sao co dinh ma process chinh khong bao gio dong toi
+        snapshot = board.copy()
+        return [
+            self._pool.submit(_smp_helper, snapshot, index, max_depth, deadline)
+            for index in range(1, self.workers)
+        ]
+
+    def _stop_helpers(self, helpers):
+        self._stop_flag.value = 1
+        self.helper_node_count = sum(f.result() for f in helpers)
+
+    def _out_of_time(self):
+        if self._stop is not None and self._stop.value:
+            return True
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _search_root(self, board, moves, depth, bot_is_white):
+        if self.parallel == "root" and self.workers and self.workers > 1 and depth > 1 and len(moves) > 1:
+            return self._search_root_parallel(board, moves, depth, bot_is_white)
+
         # Cat tia Alpha (Muc diem thap nhat chiu duoc) va Beta (Muc diem cao nhat ma doi thu cho phep minh lay)
         alpha = -math.inf
         beta = math.inf
         
         best_value = -math.inf
+        best_move = None
+        self._root_depth = depth
         
-        for state in next_states:
-            value = self.minimax(state.board, self.depth - 1, alpha, beta, False, Is_White_Turn)
+        for move in moves:
+            undo = board.make_move(move)
+            value = self.minimax(board, depth - 1, alpha, beta, False, bot_is_white)
+            board.unmake_move(undo)
             
             if value > best_value:
                 best_value = value
-                best_state = state
+                best_move = move
             
             alpha = max(alpha, best_value)
-        
-        print(f"Selected move score: {best_value}, Nodes visited: {self.node_count}")
-        return best_state
+        return best_value, best_move
+
+    def _search_root_parallel(self, board, moves, depth, bot_is_white):
+        # Nuoc dau tien (nuoc tot nhat lan lap truoc) tim o process chinh de co alpha,
+        # cac nuoc con lai chia cho process pool va dung chung alpha qua multiprocessing.Value.
+        # Diem cua nuoc tot nhat luon chinh xac, nen ket qua giong ban tuan tu (hoa -> nuoc dung truoc).
+        if self._pool is None:
+            self._shared_alpha = multiprocessing.Value('d', -math.inf)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_root_worker,
+                initargs=({**self._worker_kwargs, "tt_size_mb": self.tt_size_mb}, self._shared_alpha),
+            )
+        self._root_depth = depth
+
+        first = moves[0]
+        undo = board.make_move(first)
+        best_value = self.minimax(board, depth - 1, -math.inf, math.inf, False, bot_is_white)
+        board.unmake_move(undo)
+        best_move = first
+        self._shared_alpha.value = best_value
+
+        futures = [
+            self._pool.submit(_search_root_move, board, move, depth, bot_is_white, self._deadline)
+            for move in moves[1:]
+        ]
+        timed_out = False
+        for move, future in zip(moves[1:], futures):
+            value, counters = future.result()
+            self._add_counters(counters)
+            if value is None:
+                timed_out = True
+                continue
+            if value > best_value:
+                best_value = value
+                best_move = move
+        if timed_out:
+            raise SearchTimeout()
+        return best_value, best_move
 
     def minimax(self, board, depth, alpha, beta, maximizing_player, bot_is_white):
         self.node_count += 1
+        if self.node_count % TIME_CHECK_INTERVAL == 0 and self._out_of_time():
+            raise SearchTimeout()
         
         # Dung khi het do sau depth = 3 hoac thua game
         if depth == 0:
+            if self.quiescence:
+                return self.quiesce(board, alpha, beta, maximizing_player, bot_is_white, self._root_depth)
             return self.evaluate_board(board, bot_is_white) #Danh gia diem
         
-        # Kiem tra GameOver
-        current_turn = board.turn #Nguoi di luot ke tiep
-        if board.is_checkmate(current_turn):          
+        # Tra bang chuyen vi: the co da gap qua thu tu nuoc di khac
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = 0
+        if self.tt:
+            key = board.hash if bot_is_white else board.hash ^ BLACK_BOT_KEY
+            entry = self.tt.probe(key)
+            if entry is not None:
+                tt_move = entry.move
+                if entry.depth >= depth:
+                    if entry.bound == EXACT:
+                        return entry.score
+                    if entry.bound == LOWER:
+                        alpha = max(alpha, entry.score)
+                    elif entry.bound == UPPER:
+                        beta = min(beta, entry.score)
+                    if alpha >= beta:
+                        return entry.score
+
+        # Kiem tra GameOver (sinh nuoc hop le 1 lan, generate_moves ben duoi dung lai tu cache)
+        status = board.status()
+        if status == GameStatus.CHECKMATE:
             # Neu dang la luot cua minh bi chieu bi -> Minh thua -> Diem thap
             # Neu luot doi thu bi chieu bi -> Minh thang -> Diem cuc cao
             return -100000 if maximizing_player else 100000
-        if board.is_stalemate(current_turn):
-            return 0    # Ket qua Hoa
+        if status != GameStatus.ONGOING:
+            return 0    # Ket qua Hoa (stalemate / khong du quan chieu bi)
 
-        next_states = board.generate_next_states()
+        # Nuoc tot nhat lan truoc (trong TT) duoc thu dau tien, sau do toi an quan, phong cap, killer, history
+        ply = self._root_depth - depth
+        if ply > self.seldepth:
+            self.seldepth = ply
+        moves = self.orderer.order(board, board.generate_moves(), ply, tt_move)
 
+        best_move = None
         if maximizing_player:
-            max_eval = -math.inf
-            for state in next_states:
-                eval = self.minimax(state.board, depth - 1, alpha, beta, False, bot_is_white)
-                max_eval = max(max_eval, eval)
+            best_eval = -math.inf
+            for i, move in enumerate(moves):
+                undo = board.make_move(move)
+                eval = self.minimax(board, depth - 1, alpha, beta, False, bot_is_white)
+                board.unmake_move(undo)
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = move
                 alpha = max(alpha, eval)
                 if beta <= alpha:
+                    self._record_cutoff(board, move, ply, depth, i)
                     break       # Cat tia Beta
-            return max_eval
         else:
-            min_eval = math.inf
-            for state in next_states:
-                eval = self.minimax(state.board, depth - 1, alpha, beta, True, bot_is_white)
-                min_eval = min(min_eval, eval)
+            best_eval = math.inf
+            for i, move in enumerate(moves):
+                undo = board.make_move(move)
+                eval = self.minimax(board, depth - 1, alpha, beta, True, bot_is_white)
+                board.unmake_move(undo)
+                if eval < best_eval:
+                    best_eval = eval
+                    best_move = move
                 beta = min(beta, eval)
                 if beta <= alpha:
+                    self._record_cutoff(board, move, ply, depth, i)
                     break       # Cat tia Alpha
-            return min_eval
+
+        if self.tt:
+            if best_eval <= alpha_orig:
+                bound = UPPER
+            elif best_eval >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.tt.store(key, depth, best_eval, bound, best_move)
+        return best_eval
+
+    def _record_cutoff(self, board, move, ply, depth, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        self.orderer.record_cutoff(board, move, ply, depth)
+
+    def quiesce(self, board, alpha, beta, maximizing_player, bot_is_white, ply=0):
+        # Chi xet nuoc an quan / phong cap; ben di co the "dung yen" (stand pat) voi diem hien tai
+        self.qnode_count += 1
+        if ply > self.seldepth:
+            self.seldepth = ply
+        if self.qnode_count % TIME_CHECK_INTERVAL == 0 and self._out_of_time():
+            raise SearchTimeout()
+
+        stand_pat = self.evaluate_board(board, bot_is_white)
+        if maximizing_player:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+
+        best_eval = stand_pat
+        for move in self.orderer.order(board, board.generate_captures(), 0):
+            victim = self.orderer.captured_piece(board, move)
+            gain = PIECE_VALUES[victim.type] if victim else 0
+            if move.promotion:
+                gain += PIECE_VALUES[move.promotion] - PIECE_VALUES[PieceType.PAWN]
+            # Delta pruning
+            if maximizing_player and stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue
+            if not maximizing_player and stand_pat - gain - DELTA_MARGIN >= beta:
+                continue
+
+            undo = board.make_move(move)
+            eval = self.quiesce(board, alpha, beta, not maximizing_player, bot_is_white, ply + 1)
+            board.unmake_move(undo)
+            if maximizing_player:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break
+        return best_eval
 
     def evaluate_board(self, board, bot_is_white):
         
         # Diem so cua Bot: > 0 dang THANG, <0 dang THUA
-        
-        white_score = 0
-        black_score = 0
-        
-        for y in range(8):
-            for x in range(8):
-                piece = board.grid[y][x]
-                if not piece:
-                    continue
-                
-                # Xet diem uu tien
-                material = PIECE_VALUES.get(piece.type, 0)
-                
-                # Xet diem vi tri
-                pos_score = 0               
-                table = None
-                if piece.type == PieceType.PAWN: table = PAWN_TABLE
-                elif piece.type == PieceType.KNIGHT: table = KNIGHT_TABLE
-                elif piece.type == PieceType.BISHOP: table = BISHOP_TABLE
-                elif piece.type == PieceType.ROOK: table = ROOK_TABLE
-                elif piece.type == PieceType.QUEEN: table = QUEEN_TABLE
-                elif piece.type == PieceType.KING: table = KING_MID_TABLE
-                
-                if table:
-                    if piece.color == Color.WHITE:
-                        pos_score = table[y][x]
-                    else:
-                        # Lat Bang neu Bot la mau Den
-                        pos_score = table[7-y][x] 
-
-                if piece.color == Color.WHITE:
-                    white_score += material + pos_score
-                else:
-                    black_score += material + pos_score
-        
-        # Tong diem
-        eval_score = white_score - black_score
+        # Board.pst_score (vat chat + vi tri, Trang - Den) duoc cap nhat moi nuoc di, doc O(1)
+        eval_score = board.pst_score
 
         # Neu Bot la White, tra ve White - Black, con la Black tra ve Black - White
         if bot_is_white:
             return eval_score
         else:
-            return -eval_score
\ No newline at end of file
+            return -eval_score
@@ -4,11 +4,18 @@ from bot.bot import Bot
 from state.board import Board, NextState
 from state.piece import Color
 from machine_learning.model import ChessNet
-from machine_learning.utils import board_to_tensor
+from machine_learning.utils import piece_indices, indices_to_tensor
+from machine_learning.export import is_torchscript
+from bot.eval_cache import EvalCache
 
 class MLBot(Bot):
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, cache_size=100_000):
+        # model_path: state_dict cua train.py, hoac file TorchScript cua machine_learning/export.py
+        # cache_size: so the co toi da trong cache diem cua model (LRU theo board.hash), 0 = tat
         self.model = ChessNet()
+        self.cache = EvalCache(cache_size) if cache_size else None
+        self.inference_calls = 0    # So lan forward
+        self.positions_evaluated = 0  # So the co da dua qua model
         
     
         if model_path is None:
@@ -16,12 +23,17 @@ class MLBot(Bot):
             model_path = os.path.join(base_dir, "machine_learning", "chess_model.pth")
             
         try:
-            # If CUDA is available, load normally; otherwise map tensors to CPU
-            if torch.cuda.is_available():
-                self.model.load_state_dict(torch.load(model_path))
+            if is_torchscript(model_path):
+                # Exported model (BatchNorm folded, maybe int8): already frozen for CPU inference
+                self.model = torch.jit.load(model_path, map_location=torch.device('cpu'))
+                print("MLBot: Loaded exported TorchScript model.")
             else:
-                self.model.load_state_dict(torch.load(model_path, map_location=torch.device('cpu')))
-            print("MLBot: Loaded model successfully.")
+                # If CUDA is available, load normally; otherwise map tensors to CPU
+                if torch.cuda.is_available():
+                    self.model.load_state_dict(torch.load(model_path))
+                else:
+                    self.model.load_state_dict(torch.load(model_path, map_location=torch.device('cpu')))
+                print("MLBot: Loaded model successfully.")
         except FileNotFoundError:
             print(f"MLBot Error: Could not find model at {model_path}. Please run machine_learning/train.py first.")
         except RuntimeError as e:
@@ -35,42 +47,54 @@ class MLBot(Bot):
         self.model.eval() # Chế độ inference
 
     def choose_move(self, board: Board) -> NextState:
-        next_states = board.generate_next_states()
+        # Di thu tung nuoc tren 1 ban co (make/unmake): vua kiem tra chieu het ngay,
+        # vua ma hoa the co con, roi cham diem tat ca trong 1 lan forward duy nhat
+        work = board.copy()
+        moves = work.generate_moves()
         
-        if not next_states:
+        if not moves:
             return None
         
-        for state in next_states:
+        scores = [None] * len(moves)
+        # Chi cac the co chua co trong cache moi dua vao batch
+        encoded, missing, keys = [], [], []
+        for i, move in enumerate(moves):
+            undo = work.make_move(move)
             # Nếu đi nước này mà đối phương bị chiếu hết -> Chọn luôn!
-            if state.board.is_checkmate(state.board.turn):
-                return state
-        best_state = None
+            # (chỉ cần tìm 1 nước hợp lệ của đối phương, và chỉ khi đang bị chiếu)
+            mate = work.is_in_check(work.turn) and not work.has_legal_move()
+            if not mate:
+                if self.cache is not None:
+                    scores[i] = self.cache.get(work.hash)
+                if scores[i] is None:
+                    encoded.append(piece_indices(work))
+                    missing.append(i)
+                    keys.append(work.hash)
+            work.unmake_move(undo)
+            if mate:
+                return self._next_state(board, move)
+
+        if encoded:
+            batch = indices_to_tensor(encoded) # (N, 12, 8, 8)
+            with torch.inference_mode():
+                values = self.model(batch).view(-1).tolist()
+            self.inference_calls += 1
+            self.positions_evaluated += len(encoded)
+            for i, key, value in zip(missing, keys, values):
+                scores[i] = value
+                if self.cache is not None:
+                    self.cache.put(key, value)
         
         # Nếu Bot cầm quân Trắng, tìm điểm cao nhất (Max)
         # Nếu Bot cầm quân Đen, tìm điểm thấp nhất (Min) - vì score dương có lợi cho Trắng
-        is_white = (board.turn == Color.WHITE)
-        best_score = -float('inf') if is_white else float('inf')
-        
-        # Duyệt qua tất cả các nước đi có thể (Batch processing would be faster, but loop is simpler)
-        for state in next_states:
-            # state là object NextState, ta cần đánh giá bàn cờ sau khi đi (state.board)
-            tensor_input = board_to_tensor(state.board).unsqueeze(0) # Thêm batch dimension (1, 12, 8, 8)
-            
-            with torch.no_grad():
-                score = self.model(tensor_input).item()
-            
-            if is_white:
-                if score > best_score:
-                    best_score = score
-                    best_state = state
-            else:
-                if score < best_score:
-                    best_score = score
-                    best_state = state
-                    
-        # Fallback nếu lỗi (hiếm gặp)
-        if best_state is None:
-            import random
-            return random.choice(next_states)
-            
-        return best_state
\ No newline at end of file
+        if board.turn == Color.WHITE:
+            idx = max(range(len(moves)), key=scores.__getitem__)
+        else:
+            idx = min(range(len(moves)), key=scores.__getitem__)
+        return self._next_state(board, moves[idx])
+
+    @staticmethod
+    def _next_state(board, move):
+        newb = board.copy()
+        newb.make_move(move)
+        return NextState(board=newb, move=move)
@@ -0,0 +1,89 @@
+from state.move import pack_move
+from state.piece import PieceType
+
+# Piece values used only to rank captures (the king may capture but is never captured)
+MVV_LVA_VALUES = {
+    PieceType.PAWN: 1,
+    PieceType.KNIGHT: 3,
+    PieceType.BISHOP: 3,
+    PieceType.ROOK: 5,
+    PieceType.QUEEN: 9,
+    PieceType.KING: 10,
+}
+
+# Sort keys, from first to last: hash move, captures, promotions, killers, history
+TT_MOVE_SCORE = 1_000_000
+CAPTURE_SCORE = 100_000
+PROMOTION_SCORE = 90_000
+KILLER_SCORES = (80_000, 70_000)
+HISTORY_LIMIT = 60_000
+
+class MoveOrderer:
+    """Orders moves for alpha-beta: MVV-LVA captures, promotions, killers, history.
+
+    Killer moves are kept per ply (two slots each) and reset every search; the
+    history table scores quiet moves by from/to square and is halved between
+    searches so old results fade out. Both hold packed moves (`pack_move`):
+    killers the full code, history indexed by its low 12 (from/to) bits.
+    """
+
+    def __init__(self, max_ply=64):
+        self.max_ply = max_ply
+        self.killers = [[0, 0] for _ in range(max_ply)]
+        self.history = [0] * 4096
+
+    def new_search(self):
+        self.killers = [[0, 0] for _ in range(self.max_ply)]
+        self._age_history()
+
+    def _age_history(self):
+        self.history = [h >> 1 for h in self.history]
+
+    @staticmethod
+    def captured_piece(board, move):
+        """Piece taken by `move` on `board` (before the move is made), or None."""
+        if move.en_passant:
+            return board.get((move.to[0], move.frm[1]))
+        return board.get(move.to)
+
+    def is_quiet(self, board, move):
+        return move.promotion is None and self.captured_piece(board, move) is None
+
+    def score(self, board, move, ply, tt_move=0):
+        """Sort key of `move`; `tt_move` is the packed hash move (0 = none)."""
+        code = pack_move(move)
+        if tt_move and code == tt_move:
+            return TT_MOVE_SCORE
+        victim = self.captured_piece(board, move)
+        score = 0
+        if victim is not None:
+            score = CAPTURE_SCORE + MVV_LVA_VALUES[victim.type] * 10 - MVV_LVA_VALUES[move.piece.type]
+        if move.promotion is not None:
+            score += PROMOTION_SCORE + MVV_LVA_VALUES[move.promotion]
+        if score:
+            return score
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if code == killers[0]:
+                return KILLER_SCORES[0]
+            if code == killers[1]:
+                return KILLER_SCORES[1]
+        return self.history[code & 0xFFF]
+
+    def order(self, board, moves, ply, tt_move=0):
+        return sorted(moves, key=lambda m: self.score(board, m, ply, tt_move), reverse=True)
+
+    def record_cutoff(self, board, move, ply, depth):
+        """Remember a quiet move that caused a beta cutoff."""
+        if not self.is_quiet(board, move):
+            return
+        code = pack_move(move)
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if code != killers[0]:
+                killers[1] = killers[0]
+                killers[0] = code
+        i = code & 0xFFF
+        self.history[i] += depth * depth
+        if self.history[i] > HISTORY_LIMIT:
+            self._age_history()
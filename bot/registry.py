@@ -0,0 +1,51 @@
+"""Bots by name. Bot modules are imported on first use, so choosing Random or
+Minimax never loads torch, and heavy bots are built once and reused."""
+import importlib
+
+# name -> (module, class, default kwargs, reuse the instance across games / resets)
+BOTS = {
+    "random": ("bot.random_bot", "RandomBot", {}, False),
+    "minimax": ("bot.minimax_bot", "Minimaxbot", {"depth": 3}, False),
+    # MLBot nap model (.pth / TorchScript) tu dia: chi tao 1 lan roi dung lai
+    "ml": ("bot.ml_bot", "MLBot", {}, True),
+}
+
+ALIASES = {"mlbot": "ml"}
+
+_instances = {}
+
+def bot_names():
+    return list(BOTS)
+
+def resolve(name):
+    """Registry key for a (case-insensitive) bot name or alias; ValueError if unknown."""
+    key = (name or "").strip().lower()
+    key = ALIASES.get(key, key)
+    if key not in BOTS:
+        raise ValueError(f"Unknown bot: {name!r} (available: {', '.join(BOTS)})")
+    return key
+
+def bot_class(name):
+    """Import the bot's module (first call only) and return its class."""
+    module, cls, _, _ = BOTS[resolve(name)]
+    return getattr(importlib.import_module(module), cls)
+
+def get_bot(name, **kwargs):
+    """A bot built with its defaults updated by `kwargs`.
+
+    Bots marked for reuse are cached per (name, kwargs), so e.g. the GUI's
+    Reset does not reload the ML model from disk.
+    """
+    key = resolve(name)
+    _, _, defaults, reuse = BOTS[key]
+    options = {**defaults, **kwargs}
+    cache_key = (key, tuple(sorted(options.items())))
+    if reuse and cache_key in _instances:
+        return _instances[cache_key]
+    bot = bot_class(key)(**options)
+    if reuse:
+        _instances[cache_key] = bot
+    return bot
+
+def clear_cache():
+    _instances.clear()
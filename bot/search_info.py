@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from state.move import Move
+
+@dataclass
+class SearchInfo:
+    """Statistics for one completed iteration of a search, passed to `info_callback`."""
+    depth: int
+    seldepth: int               # Ply sau nhat da toi (ke ca quiescence)
+    score: float                # Theo goc nhin cua ben di o goc
+    nodes: int
+    qnodes: int
+    elapsed: float              # Giay, tinh tu luc bat dau choose_move
+    pv: List[Move] = field(default_factory=list)
+    tt_hit_rate: float = 0.0
+    cutoffs: int = 0            # So lan cat tia beta/alpha
+    first_move_cutoffs: int = 0 # ... trong do cat ngay o nuoc dau tien (thu tu nuoc tot)
+    helper_nodes: int = 0       # Node cua process phu Lazy SMP (chi co o lan lap cuoi)
+
+    @property
+    def total_nodes(self):
+        return self.nodes + self.qnodes + self.helper_nodes
+
+    @property
+    def nps(self):
+        return self.total_nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def best_move(self) -> Optional[Move]:
+        return self.pv[0] if self.pv else None
+
+    def __str__(self):
+        pv = " ".join(m.uci() for m in self.pv)
+        return (f"depth {self.depth} seldepth {self.seldepth} score {self.score} "
+                f"nodes {self.total_nodes} nps {self.nps:.0f} time {self.elapsed * 1000:.0f}ms "
+                f"tthit {self.tt_hit_rate:.1%} cutoffs {self.cutoffs} "
+                f"first {self.first_move_cutoff_rate:.1%} pv {pv}")
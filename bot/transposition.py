@@ -0,0 +1,214 @@
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+from state.move import pack_move
+
+# Bound types: what `score` means relative to the true value of the position
+EXACT = 0   # score is the true minimax value
+LOWER = 1   # search failed high, true value >= score
+UPPER = 2   # search failed low, true value <= score
+
+# move: nuoc tot nhat dang ma 16 bit (state.move.pack_move), 0 = khong co
+TTEntry = namedtuple("TTEntry", ["key", "depth", "score", "bound", "move", "age"])
+
+# Rough CPython footprint of one stored entry (tuple + ints + list slot)
+ENTRY_BYTES = 128
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed on a 64-bit position hash.
+
+    Each bucket has two slots: the first keeps the deepest result seen for the
+    bucket (depth-preferred), the second always takes the newest result. Entries
+    left over from earlier searches lose their depth priority.
+    """
+
+    def __init__(self, size_mb=16):
+        self.num_buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        self.slots = [None] * (2 * self.num_buckets)
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """Mark existing entries as stale so fresh results can replace them."""
+        self.age += 1
+
+    def clear(self):
+        self.slots = [None] * (2 * self.num_buckets)
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        i = (key % self.num_buckets) * 2
+        entry = self.slots[i]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        entry = self.slots[i + 1]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        i = (key % self.num_buckets) * 2
+        entry = TTEntry(key, depth, score, bound, pack_move(move), self.age)
+        deep = self.slots[i]
+        if deep is None or deep.key == key or depth >= deep.depth or deep.age != self.age:
+            if deep is not None and deep.key != key:
+                self.overwrites += 1
+            self.slots[i] = entry
+            return
+        recent = self.slots[i + 1]
+        if recent is not None and recent.key != key:
+            self.overwrites += 1
+        self.slots[i + 1] = entry
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hit_rate(),
+        }
+
+
+# ---------- SHARED-MEMORY TABLE (Lazy SMP) ----------
+SCORE_OFFSET = 1 << 31
+# 2 slots per bucket, 2 words per slot: (key ^ data, data)
+WORDS_PER_BUCKET = 4
+BYTES_PER_BUCKET = WORDS_PER_BUCKET * 8
+
+def _pack(depth, score, bound, move, age):
+    score = min(max(int(score) + SCORE_OFFSET, 0), (1 << 32) - 1)
+    # bound + 1 keeps every packed entry non-zero, so 0 marks an empty slot
+    return score | min(depth, 255) << 32 | (bound + 1) << 40 | (age & 63) << 42 | pack_move(move) << 48
+
+def _unpack(key, data):
+    return TTEntry(
+        key,
+        (data >> 32) & 255,
+        (data & 0xFFFFFFFF) - SCORE_OFFSET,
+        ((data >> 40) & 3) - 1,
+        data >> 48,
+        (data >> 42) & 63,
+    )
+
+class SharedTranspositionTable:
+    """`TranspositionTable` variant stored in `multiprocessing.shared_memory`.
+
+    Entries are packed into two 64-bit words, `key ^ data` and `data`, so a slot
+    torn by a concurrent writer simply fails the key check instead of returning
+    mixed-up data. No locks are taken. Create the table in the parent process
+    and attach helpers with `SharedTranspositionTable(name=..., num_buckets=...)`.
+    Hit/miss/overwrite counters are per process. Call `close()` (or use it as a
+    context manager) when done; it also runs when the table is garbage collected.
+    """
+
+    def __init__(self, size_mb=16, name=None, num_buckets=None):
+        if name is None:
+            self.num_buckets = max(1, int(size_mb * 1024 * 1024) // BYTES_PER_BUCKET)
+            self.shm = shared_memory.SharedMemory(create=True, size=self.num_buckets * BYTES_PER_BUCKET)
+            self.owner = True
+        else:
+            self.num_buckets = num_buckets
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.table = self.shm.buf.cast('Q')
+        if self.owner:
+            self.clear()
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def new_search(self):
+        self.age = (self.age + 1) & 63
+
+    def clear(self):
+        size = self.num_buckets * BYTES_PER_BUCKET
+        self.shm.buf[:size] = bytes(size)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        table = self.table
+        i = (key % self.num_buckets) * WORDS_PER_BUCKET
+        for j in (i, i + 2):
+            data = table[j + 1]
+            if data and table[j] ^ data == key:
+                self.hits += 1
+                return _unpack(key, data)
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        table = self.table
+        i = (key % self.num_buckets) * WORDS_PER_BUCKET
+        data = _pack(depth, score, bound, move, self.age)
+        deep = table[i + 1]
+        deep_key = table[i] ^ deep
+        if (not deep or deep_key == key or depth >= (deep >> 32) & 255
+                or (deep >> 42) & 63 != self.age):
+            if deep and deep_key != key:
+                self.overwrites += 1
+            j = i
+        else:
+            recent = table[i + 3]
+            if recent and table[i + 2] ^ recent != key:
+                self.overwrites += 1
+            j = i + 2
+        table[j] = key ^ data
+        table[j + 1] = data
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def close(self):
+        """Detach from the shared block; the creating process also frees it. Safe to call twice."""
+        if getattr(self, "shm", None) is None:
+            return
+        # The memoryview must go first: SharedMemory.close() refuses while it is exported
+        self.table.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+        self.table = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
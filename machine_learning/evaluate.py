@@ -1,7 +1,6 @@
 import time
-from bot.ml_bot import MLBot
-from bot.random_bot import RandomBot
-from state.board import Board, Color
+from bot.registry import get_bot
+from state.board import Board, GameStatus, Color
 
 def play_match(white_bot, black_bot, max_moves=1000):
     """
@@ -12,14 +11,14 @@ def play_match(white_bot, black_bot, max_moves=1000):
     moves = 0
     
     while moves < max_moves:
-        # 1. Kiểm tra kết thúc game trước khi đi
-        if not board._has_legal_moves_for(board.turn):
-            if board.is_in_check(board.turn):
-                # Bị chiếu mà không đi được -> Thua
-                return -1 if board.turn == Color.WHITE else 1
-            else:
-                # Không đi được nhưng không bị chiếu -> Hòa (Stalemate)
-                return 0
+        # 1. Kiểm tra kết thúc game trước khi đi (nước hợp lệ được cache cho bot dùng lại)
+        status = board.status()
+        if status == GameStatus.CHECKMATE:
+            # Bị chiếu mà không đi được -> Thua
+            return -1 if board.turn == Color.WHITE else 1
+        if status != GameStatus.ONGOING:
+            # Hết nước nhưng không bị chiếu (Stalemate) hoặc không đủ quân -> Hòa
+            return 0
 
         # 2. Chọn nước đi
         try:
@@ -52,8 +51,8 @@ def run_tournament(num_games=10):
     print(f"{'='*40}")
 
     # Load bot (Chỉ load 1 lần để tiết kiệm thời gian)
-    white_bot = MLBot()
-    black_bot = RandomBot()
+    white_bot = get_bot("ml")
+    black_bot = get_bot("random")
 
     stats = {"ML_Win": 0, "Random_Win": 0, "Draw": 0}
 
@@ -83,6 +82,11 @@ def run_tournament(num_games=10):
     print(f"--- Random Bot thắng: {stats['Random_Win']} ({stats['Random_Win']/num_games*100:.1f}%)")
     print(f"--- Hòa             : {stats['Draw']} ({stats['Draw']/num_games*100:.1f}%)")
     print(f"{'='*40}")
+    if white_bot.cache is not None:
+        cache = white_bot.cache.stats()
+        print(f"--- Cache MLBot     : {cache['hits']} hit / {cache['misses']} miss ({cache['hit_rate']*100:.1f}%), "
+              f"{white_bot.inference_calls} lần forward, {white_bot.positions_evaluated} thế cờ")
+        print(f"{'='*40}")
 
 if __name__ == "__main__":
     run_tournament(num_games=100)
\ No newline at end of file
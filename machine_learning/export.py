@@ -0,0 +1,145 @@
+"""Inference export of ChessNet for CPU: fold BatchNorm into the convolutions,
+optionally quantize the Linear layers to int8 (dynamic), and trace + freeze to TorchScript.
+
+    python machine_learning/export.py                                  # chess_model.pth -> chess_model.ts
+    python machine_learning/export.py --quantize --out chess_model_int8.ts
+
+MLBot(model_path="machine_learning/chess_model.ts") loads the result directly.
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import zipfile
+
+import torch
+import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state.board import Board
+from state.piece import Color
+from machine_learning.model import ChessNet
+from machine_learning.utils import boards_to_tensor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL = os.path.join(BASE_DIR, "chess_model.pth")
+DEFAULT_EXPORT = os.path.join(BASE_DIR, "chess_model.ts")
+
+# (conv, batchnorm) cặp được gộp
+CONV_BN_PAIRS = [("conv1", "bn1"), ("conv2", "bn2"), ("conv3", "bn3")]
+
+def load_chessnet(path=DEFAULT_MODEL):
+    """ChessNet fp32 (eval mode, CPU) từ file state_dict của train.py."""
+    model = ChessNet()
+    model.load_state_dict(torch.load(path, map_location=torch.device('cpu')))
+    return model.eval()
+
+def fold_batchnorm(model):
+    """
+    Bản sao của model với bn1..bn3 gộp vào conv1..conv3 (trọng số conv được nhân
+    với scale của BN, bias cộng thêm shift), BN thay bằng Identity.
+    Chỉ đúng ở chế độ eval (dùng running mean/var).
+    """
+    folded = copy.deepcopy(model).eval()
+    for conv_name, bn_name in CONV_BN_PAIRS:
+        conv = getattr(folded, conv_name)
+        bn = getattr(folded, bn_name)
+        setattr(folded, conv_name, fuse_conv_bn_eval(conv, bn))
+        setattr(folded, bn_name, nn.Identity())
+    return folded
+
+def quantize_linear(model):
+    """Dynamic int8 quantization cho các lớp Linear (fc1 8192x512 chiếm phần lớn trọng số)."""
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+def export_model(model, quantize=False):
+    """Fold BN -> (int8) -> trace + freeze TorchScript. Batch size của input là tuỳ ý."""
+    model = fold_batchnorm(model)
+    if quantize:
+        model = quantize_linear(model)
+    example = torch.zeros(1, 12, 8, 8)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    return torch.jit.freeze(traced.eval())
+
+def is_torchscript(path):
+    """File TorchScript (torch.jit.save) có thư mục code/, còn state_dict (torch.save) thì không."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return any("/code/" in name for name in archive.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+def load_inference_model(path):
+    """Model sẵn sàng để chấm điểm: file export (TorchScript) hoặc state_dict fp32."""
+    if is_torchscript(path):
+        return torch.jit.load(path, map_location=torch.device('cpu')).eval()
+    return load_chessnet(path)
+
+def random_positions(count, max_plies=60, seed=0):
+    """Các thế cờ gặp trong những ván đi ngẫu nhiên (dùng để đo drift / benchmark)."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        for _ in range(rng.randint(1, max_plies)):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            positions.append(board.copy())
+    return positions[:count]
+
+def accuracy_drift(reference, model, boards, roots=64):
+    """
+    So model export với model fp32 gốc.
+    - max_abs / mean_abs: sai lệch điểm số trên `boards`
+    - move_agreement: tỉ lệ thế cờ (trong `roots` thế đầu) mà 2 model chọn cùng nước đi
+      theo cách MLBot chọn (max cho Trắng, min cho Đen trên các thế cờ con)
+    """
+    batch = boards_to_tensor(boards)
+    with torch.inference_mode():
+        diff = (reference(batch) - model(batch)).abs().view(-1)
+
+    agree = total = 0
+    for board in boards[:roots]:
+        children = [st.board for st in board.generate_next_states()]
+        if not children:
+            continue
+        batch = boards_to_tensor(children)
+        with torch.inference_mode():
+            ref_scores = reference(batch).view(-1)
+            new_scores = model(batch).view(-1)
+        pick = torch.argmax if board.turn == Color.WHITE else torch.argmin
+        agree += int(pick(ref_scores) == pick(new_scores))
+        total += 1
+    return {
+        "max_abs": float(diff.max()),
+        "mean_abs": float(diff.mean()),
+        "move_agreement": agree / total if total else 1.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export ChessNet for CPU inference")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="state_dict from train.py")
+    parser.add_argument("--out", default=DEFAULT_EXPORT)
+    parser.add_argument("--quantize", action="store_true", help="dynamic int8 quantization of the Linear layers")
+    parser.add_argument("--check", type=int, default=1024, help="positions for the accuracy-drift check (0 = skip)")
+    args = parser.parse_args(argv)
+
+    reference = load_chessnet(args.model)
+    exported = export_model(reference, quantize=args.quantize)
+    torch.jit.save(exported, args.out)
+    print(f"Saved {'int8' if args.quantize else 'fp32'} TorchScript model to {args.out}")
+
+    if args.check:
+        drift = accuracy_drift(reference, exported, random_positions(args.check))
+        print(f"Drift vs fp32 on {args.check} positions: max {drift['max_abs']:.5f}, "
+              f"mean {drift['mean_abs']:.5f}, same move {drift['move_agreement']:.1%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,16 @@ import numpy as np
 import random
 import os
 import sys
+import time
+import argparse
+import queue
+import torch.multiprocessing as mp
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from state.board import Board, Color
+from state.board import Board, GameStatus, Color
 from machine_learning.model import ChessNet
-from machine_learning.utils import board_to_tensor, get_material_score
+from machine_learning.utils import boards_to_tensor, piece_indices, indices_to_tensor, get_material_score
 
 # --- CẤU HÌNH ---
 EPISODES = 250       # Số ván tự chơi (Self-play)
@@ -20,10 +24,12 @@ EPSILON_END = 0.1    # Tỉ lệ đi ngẫu nhiên lúc sau (tối ưu)
 EPSILON_DECAY = 0.995
 LEARNING_RATE = 0.001
 BATCH_SIZE = 128
+MEMORY_SIZE = 5000   # Số thế cờ giữ lại trong bộ nhớ replay
+WEIGHT_SYNC_GAMES = 10  # Self-play song song: cứ sau ngần này ván, learner gửi trọng số mới cho các worker
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-def select_move_epsilon(model, board, epsilon):
+def select_move_epsilon(model, board, epsilon, device=device):
     """Chọn nước đi: Epsilon% ngẫu nhiên, (1-Epsilon)% theo Model"""
     next_states = board.generate_next_states()
     if not next_states: return None
@@ -36,12 +42,8 @@ def select_move_epsilon(model, board, epsilon):
     best_state = None
     best_score = -float('inf') if board.turn == Color.WHITE else float('inf')
     
-    # Batch processing để nhanh hơn
-    tensor_list = []
-    for st in next_states:
-        tensor_list.append(board_to_tensor(st.board).numpy())
-    
-    batch_tensors = torch.tensor(np.array(tensor_list)).to(device)
+    # Batch processing để nhanh hơn: mã hoá thẳng cả batch (N, 12, 8, 8), không copy trung gian
+    batch_tensors = boards_to_tensor([st.board for st in next_states]).to(device)
     
     with torch.no_grad():
         scores = model(batch_tensors).cpu().numpy().flatten()
@@ -53,7 +55,103 @@ def select_move_epsilon(model, board, epsilon):
         
     return next_states[idx]
 
-def train_self_play():
+def play_game(model, epsilon, device=device):
+    """
+    Tự chơi 1 ván. Trả về (game_history, winner, moves_count):
+    game_history là danh sách piece_indices của các thế cờ sau mỗi nước đi,
+    winner: 0 Hòa, 1 Trắng thắng, -1 Đen thắng.
+    """
+    board = Board()
+    game_history = [] # Lưu các trạng thái trong ván này
+    winner = 0
+    moves_count = 0
+
+    while moves_count < MAX_MOVES:
+        # Kiểm tra kết thúc game
+        status = board.status()
+        if status == GameStatus.CHECKMATE:
+            winner = -1 if board.turn == Color.WHITE else 1
+            break
+        if status != GameStatus.ONGOING:
+            winner = 0 # Hòa (stalemate / không đủ quân / 50 nước)
+            break
+
+        # Bot chọn nước đi
+        next_state = select_move_epsilon(model, board, epsilon, device)
+        if next_state is None: break # Hòa/Lỗi
+
+        # Lưu trạng thái vào lịch sử ván đấu
+        # Note: Lưu tensor của bàn cờ TRƯỚC khi đi hay SAU khi đi?
+        # Với Value Network, ta đánh giá thế cờ HIỆN TẠI.
+        # Chỉ lưu mảng piece_indices (<= 32 số int16) thay vì cả tensor 12x8x8
+        game_history.append(piece_indices(next_state.board))
+
+        board = next_state.board
+        moves_count += 1
+
+    return game_history, winner, moves_count
+
+def epsilon_after(games):
+    """Epsilon sau `games` ván (giảm dần từ EPSILON_START xuống EPSILON_END)."""
+    return max(EPSILON_END, EPSILON_START * EPSILON_DECAY ** games)
+
+def remember(memory, game_history, winner):
+    # --- GIAI ĐOẠN 2: TẠO DỮ LIỆU TRAINING (REWARD ASSIGNMENT) ---
+    # Gán nhãn cho toàn bộ nước đi trong ván
+    # Nếu Trắng thắng (1): Mọi thế cờ dẫn đến kết quả này đều có xu hướng = 1
+    # Nhưng để thông minh hơn, ta cộng thêm điểm Material (heuristic) để dẫn hướng ban đầu
+    for state_indices in game_history:
+        # Reward shaping: Kết hợp Kết quả ván cờ + Lợi thế vật chất
+        # target = (Kết quả thực tế * 0.7) + (Điểm vật chất quy đổi * 0.3)
+        # Điều này giúp bot không bị "mù" khi chưa thắng ván nào
+
+        # Tính điểm vật chất đơn giản (-1 đến 1)
+        # Giả sử max material diff là 20
+        # material_val = get_material_score(...) / 20.0
+        # Tuy nhiên để đơn giản, ta dùng Pure Monte Carlo trước:
+
+        target = float(winner)
+
+        # Lưu vào bộ nhớ chung
+        memory.append((state_indices, target))
+
+    # Giữ bộ nhớ không quá lớn (quên bớt cái cũ)
+    if len(memory) > MEMORY_SIZE:
+        del memory[:-MEMORY_SIZE]
+
+def train_step(model, optimizer, criterion, memory):
+    """
+    --- GIAI ĐOẠN 3: HUẤN LUYỆN (TRAINING) ---
+    1 bước gradient trên batch lấy ngẫu nhiên từ memory (Experience Replay).
+    Trả về loss, hoặc None nếu chưa đủ dữ liệu.
+    """
+    if len(memory) <= BATCH_SIZE:
+        return None
+    batch = random.sample(memory, BATCH_SIZE)
+    states_b, targets_b = zip(*batch)
+
+    states_tensor = indices_to_tensor(states_b).to(device)
+    targets_tensor = torch.tensor(targets_b, dtype=torch.float32).unsqueeze(1).to(device)
+
+    optimizer.zero_grad()
+    outputs = model(states_tensor)
+    loss = criterion(outputs, targets_tensor)
+    loss.backward()
+    optimizer.step()
+    return loss.item()
+
+def log_episode(episode, winner, moves_count, epsilon, loss, extra=""):
+    result_str = "Hòa"
+    if winner == 1: result_str = "Trắng Thắng"
+    if winner == -1: result_str = "Đen Thắng"
+    loss_str = f"{loss:.4f}" if loss is not None else "-"
+    print(f"Ep {episode}: {result_str} (Moves: {moves_count}, Eps: {epsilon:.2f}, Loss: {loss_str}){extra}")
+
+def train_self_play(episodes=EPISODES, workers=1):
+    """Tự chơi + huấn luyện. workers > 1: sinh ván song song (xem train_self_play_parallel)."""
+    if workers > 1:
+        return train_self_play_parallel(episodes, workers)
+
     print(f"--- Bắt đầu Training Self-Play trên {device} ---")
     
     model = ChessNet().to(device)
@@ -61,87 +159,26 @@ def train_self_play():
     optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
     criterion = nn.MSELoss()
     
-    epsilon = EPSILON_START
-    memory = [] # Lưu trữ dữ liệu: (board_tensor, target_value)
+    memory = [] # Lưu trữ dữ liệu: (piece_indices của bàn cờ, target_value)
+    loss = None
+
+    for episode in range(1, episodes + 1):
+        epsilon = epsilon_after(episode - 1)
 
-    for episode in range(1, EPISODES + 1):
-        board = Board()
-        game_history = [] # Lưu các trạng thái trong ván này
-        
         # --- GIAI ĐOẠN 1: TỰ CHƠI (SELF-PLAY) ---
-        winner = 0 # 0: Hòa, 1: Trắng, -1: Đen
-        moves_count = 0
-        
-        while moves_count < MAX_MOVES:
-            # Kiểm tra kết thúc game
-            if not board._has_legal_moves_for(board.turn):
-                if board.is_in_check(board.turn):
-                    winner = -1 if board.turn == Color.WHITE else 1
-                else:
-                    winner = 0 # Hòa stalemate
-                break
-                
-            # Bot chọn nước đi
-            next_state = select_move_epsilon(model, board, epsilon)
-            if next_state is None: break # Hòa/Lỗi
-            
-            # Lưu trạng thái vào lịch sử ván đấu
-            # Note: Lưu tensor của bàn cờ TRƯỚC khi đi hay SAU khi đi?
-            # Với Value Network, ta đánh giá thế cờ HIỆN TẠI.
-            game_history.append(board_to_tensor(next_state.board))
-            
-            board = next_state.board
-            moves_count += 1
-            
-        # Giảm epsilon dần dần
-        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
+        model.eval()
+        game_history, winner, moves_count = play_game(model, epsilon)
+        remember(memory, game_history, winner)
 
-        # --- GIAI ĐOẠN 2: TẠO DỮ LIỆU TRAINING (REWARD ASSIGNMENT) ---
-        # Gán nhãn cho toàn bộ nước đi trong ván
-        # Nếu Trắng thắng (1): Mọi thế cờ dẫn đến kết quả này đều có xu hướng = 1
-        # Nhưng để thông minh hơn, ta cộng thêm điểm Material (heuristic) để dẫn hướng ban đầu
-        
-        for state_tensor in game_history:
-            # Reward shaping: Kết hợp Kết quả ván cờ + Lợi thế vật chất
-            # target = (Kết quả thực tế * 0.7) + (Điểm vật chất quy đổi * 0.3)
-            # Điều này giúp bot không bị "mù" khi chưa thắng ván nào
-            
-            # Tính điểm vật chất đơn giản (-1 đến 1)
-            # Giả sử max material diff là 20
-            # material_val = get_material_score(...) / 20.0 
-            # Tuy nhiên để đơn giản, ta dùng Pure Monte Carlo trước:
-            
-            target = float(winner) 
-            
-            # Lưu vào bộ nhớ chung
-            memory.append((state_tensor, target))
-
-        # --- GIAI ĐOẠN 3: HUẤN LUYỆN (TRAINING) ---
-        # Chỉ train khi đủ dữ liệu hoặc hết ván
-        if len(memory) > BATCH_SIZE:
-            # Lấy ngẫu nhiên batch để học (Experience Replay)
-            batch = random.sample(memory, BATCH_SIZE)
-            states_b, targets_b = zip(*batch)
-            
-            states_tensor = torch.stack(states_b).to(device)
-            targets_tensor = torch.tensor(targets_b, dtype=torch.float32).unsqueeze(1).to(device)
-            
-            optimizer.zero_grad()
-            outputs = model(states_tensor)
-            loss = criterion(outputs, targets_tensor)
-            loss.backward()
-            optimizer.step()
-            
-            # Giữ bộ nhớ không quá lớn (quên bớt cái cũ)
-            if len(memory) > 5000:
-                memory = memory[-5000:]
+        # Chỉ train khi đủ dữ liệu
+        model.train()
+        step_loss = train_step(model, optimizer, criterion, memory)
+        if step_loss is not None:
+            loss = step_loss
                 
         # Log kết quả
         if episode % 10 == 0:
-            result_str = "Hòa"
-            if winner == 1: result_str = "Trắng Thắng"
-            if winner == -1: result_str = "Đen Thắng"
-            print(f"Ep {episode}: {result_str} (Moves: {moves_count}, Eps: {epsilon:.2f}, Loss: {loss.item():.4f})")
+            log_episode(episode, winner, moves_count, epsilon_after(episode), loss)
             
         # Lưu model định kỳ
         if episode % 50 == 0:
@@ -150,5 +187,115 @@ def train_self_play():
     print("--- Hoàn tất Training RL ---")
     torch.save(model.state_dict(), "chess_model.pth") # Ghi đè model chính
 
+
+# ---------- SELF-PLAY SONG SONG ----------
+# N process tự chơi với bản sao trọng số (CPU, shared memory) được learner làm mới định kỳ,
+# gửi từng ván xong (piece_indices, kết quả) về qua queue. Learner vừa nhận ván vừa train.
+def _self_play_worker(worker_id, shared_model, weights_version, games_started, records, stop, seed):
+    torch.set_num_threads(1)    # Mỗi worker 1 core, tránh tranh CPU giữa các process
+    random.seed(seed)
+    cpu = torch.device("cpu")
+    model = ChessNet()
+    version = -1
+    while not stop.is_set():
+        # Lấy trọng số mới nhất (nếu learner vừa cập nhật) trước mỗi ván
+        if weights_version.value != version:
+            with weights_version.get_lock():
+                version = weights_version.value
+                model.load_state_dict(shared_model.state_dict())
+            model.eval()
+        with games_started.get_lock():
+            games = games_started.value
+            games_started.value += 1
+        game_history, winner, moves_count = play_game(model, epsilon_after(games), cpu)
+        records.put((worker_id, game_history, winner, moves_count))
+
+def _publish_weights(model, shared_model, weights_version):
+    with weights_version.get_lock():
+        shared_model.load_state_dict(model.state_dict())
+        weights_version.value += 1
+
+def train_self_play_parallel(episodes=EPISODES, workers=None):
+    workers = workers or os.cpu_count()
+    print(f"--- Bắt đầu Training Self-Play trên {device}, {workers} process tự chơi ---")
+
+    ctx = mp.get_context("spawn")
+    model = ChessNet().to(device)
+    optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
+    criterion = nn.MSELoss()
+
+    # Bản trọng số dùng chung (CPU, shared memory) mà các worker đọc
+    shared_model = ChessNet()
+    shared_model.load_state_dict(model.state_dict())
+    shared_model.share_memory()
+    weights_version = ctx.Value('i', 0)
+    games_started = ctx.Value('i', 0)
+    records = ctx.Queue(maxsize=4 * workers)
+    stop = ctx.Event()
+    procs = [
+        ctx.Process(
+            target=_self_play_worker,
+            args=(i, shared_model, weights_version, games_started, records, stop, random.randrange(1 << 30)),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    memory = []
+    loss = None
+    episode = 0
+    samples = 0
+    start = time.perf_counter()
+    try:
+        while episode < episodes:
+            # Worker không chờ learner: trong lúc learner train, các ván tiếp theo vẫn đang được chơi
+            try:
+                _, game_history, winner, moves_count = records.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs):
+                    raise RuntimeError("All self-play workers exited")
+                continue
+
+            episode += 1
+            samples += len(game_history)
+            remember(memory, game_history, winner)
+            model.train()
+            step_loss = train_step(model, optimizer, criterion, memory)
+            if step_loss is not None:
+                loss = step_loss
+
+            if episode % WEIGHT_SYNC_GAMES == 0:
+                _publish_weights(model, shared_model, weights_version)
+
+            # Log kết quả
+            if episode % 10 == 0:
+                rate = samples / (time.perf_counter() - start)
+                log_episode(episode, winner, moves_count, epsilon_after(episode), loss,
+                            f" | {rate:.0f} samples/s")
+
+            # Lưu model định kỳ
+            if episode % 50 == 0:
+                torch.save(model.state_dict(), "chess_model.pth")
+    finally:
+        stop.set()
+        # Rút hết ván còn trong queue để worker không bị kẹt ở put()
+        while any(p.is_alive() for p in procs):
+            try:
+                records.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for p in procs:
+            p.join()
+
+    elapsed = time.perf_counter() - start
+    print(f"--- Hoàn tất Training RL: {samples} thế cờ trong {elapsed:.1f}s ({samples / elapsed:.0f} samples/s) ---")
+    torch.save(model.state_dict(), "chess_model.pth") # Ghi đè model chính
+
 if __name__ == "__main__":
-    train_self_play()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Self-play training for ChessNet")
+    parser.add_argument("--episodes", type=int, default=EPISODES)
+    parser.add_argument("--workers", type=int, default=1, help="số process tự chơi song song (1 = tuần tự)")
+    args = parser.parse_args()
+    train_self_play(args.episodes, args.workers)
@@ -1,7 +1,7 @@
 import torch
 import numpy as np
 from state.board import Board
-from state.piece import PieceType, Color
+from state.piece import Piece, PieceType, Color
 
 # Mapping loại quân sang index (0-5)
 PIECE_TYPE_MAP = {
@@ -13,52 +13,57 @@ PIECE_TYPE_MAP = {
     PieceType.KING: 5
 }
 
-# Điểm số cơ bản 
-PIECE_VALUES = {
-    PieceType.PAWN: 1,
-    PieceType.KNIGHT: 3,
-    PieceType.BISHOP: 3,
-    PieceType.ROOK: 5,
-    PieceType.QUEEN: 9,
-    PieceType.KING: 0
+# Channel của từng quân (Piece là flyweight nên tra dict theo instance rất nhanh)
+# Channel 0-5: Quân Trắng (P, N, B, R, Q, K), Channel 6-11: Quân Đen
+PIECE_CHANNEL = {
+    Piece(t, c): idx + (6 if c == Color.BLACK else 0)
+    for t, idx in PIECE_TYPE_MAP.items()
+    for c in (Color.WHITE, Color.BLACK)
 }
 
+PLANE_SIZE = 12 * 8 * 8
+
+def piece_indices(board: Board):
+    """
+    Mảng gọn (int16, <= 32 phần tử) chứa vị trí phẳng channel*64 + y*8 + x
+    của từng quân trên bàn cờ. Đủ để dựng lại tensor, nhẹ hơn nhiều so với (12,8,8).
+    """
+    return np.fromiter(
+        (PIECE_CHANNEL[p] * 64 + y * 8 + x
+         for pieces in board.piece_lists.values()
+         for (x, y), p in pieces.items()),
+        dtype=np.int16,
+    )
+
+def indices_to_tensor(index_arrays):
+    """
+    Batch (N, 12, 8, 8) từ N mảng piece_indices: ghi thẳng vào 1 mảng cấp phát sẵn
+    bằng fancy indexing, rồi chia sẻ bộ nhớ sang torch (from_numpy, không copy).
+    """
+    n = len(index_arrays)
+    batch = np.zeros((n, 12, 8, 8), dtype=np.float32)
+    if n:
+        rows = np.repeat(np.arange(n), [len(idx) for idx in index_arrays])
+        cols = np.concatenate(index_arrays)
+        batch.reshape(n, PLANE_SIZE)[rows, cols] = 1.0
+    return torch.from_numpy(batch)
+
+def boards_to_tensor(boards):
+    """Mã hoá nhiều bàn cờ thành 1 tensor (N, 12, 8, 8)."""
+    return indices_to_tensor([piece_indices(b) for b in boards])
+
 def board_to_tensor(board: Board):
     """
     Chuyển object Board custom thành Tensor 12x8x8.
     Channel 0-5: Quân Trắng (P, N, B, R, Q, K)
     Channel 6-11: Quân Đen (P, N, B, R, Q, K)
     """
-    # 12 channels, 8 rows, 8 cols
-    matrix = np.zeros((12, 8, 8), dtype=np.float32)
-    
-    for y in range(8):
-        for x in range(8):
-            p = board.grid[y][x]
-            if p is not None:
-                piece_idx = PIECE_TYPE_MAP[p.type]
-                
-                # Nếu là màu Đen thì cộng thêm 6 vào index channel
-                if p.color == Color.BLACK:
-                    piece_idx += 6
-                
-                matrix[piece_idx, y, x] = 1.0
-                
-    return torch.tensor(matrix)
+    return boards_to_tensor([board])[0]
 
 def get_material_score(board: Board):
     """
     Tính tổng điểm bàn cờ dựa trên quân số.
     Score > 0: Trắng ưu thế. Score < 0: Đen ưu thế.
     """
-    score = 0
-    for y in range(8):
-        for x in range(8):
-            p = board.grid[y][x]
-            if p is not None:
-                val = PIECE_VALUES[p.type]
-                if p.color == Color.WHITE:
-                    score += val
-                else:
-                    score -= val
-    return float(score)
\ No newline at end of file
+    # Board.material được cập nhật sau mỗi nước đi, không cần quét bàn cờ
+    return float(board.material[Color.WHITE] - board.material[Color.BLACK])
\ No newline at end of file
@@ -1,9 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from bot.random_bot import RandomBot
-from bot.minimax_bot import Minimaxbot
-from state.board import Board, PieceType, Color
-from bot.ml_bot import MLBot  # <--- Import Bot ML mới
+from bot.registry import get_bot
+from state.board import Board, GameStatus, PieceType, Color
 
 
 SQUARE_SIZE = 64
@@ -71,8 +69,8 @@ class ChessGUI:
 
         # Game stateM
         self.board = Board()
-        self.white_bot = RandomBot()
-        self.black_bot = RandomBot()
+        self.white_bot = get_bot('random')
+        self.black_bot = get_bot('random')
         self.running = False
         self.move_count = 0
 
@@ -134,13 +132,13 @@ class ChessGUI:
         self.update_status()
 
     def _make_bot(self, choice):
-        # use a fixed default depth for Minimax
-        c = (choice or '').strip().lower()
-        if c == 'minimax':
-            return Minimaxbot(depth=3)
-        if c in ('ml', 'mlbot'):
-            return MLBot()
-        return RandomBot()
+        # bots come from bot/registry.py: modules are imported on first use (torch only
+        # when ML is picked), Minimax uses the registry's fixed depth and the ML model
+        # is loaded once and reused across Start/Reset
+        try:
+            return get_bot(choice)
+        except ValueError:
+            return get_bot('random')
 
     def _loop(self):
         if not self.running:
@@ -152,10 +150,8 @@ class ChessGUI:
     def _play_one(self):
         # Determine whose turn and get move from corresponding bot
         try:
-            if self.board.turn == Color.WHITE:
-                nxt = self.white_bot.choose_move(self.board)
-            else:
-                nxt = self.black_bot.choose_move(self.board)
+            bot = self.white_bot if self.board.turn == Color.WHITE else self.black_bot
+            nxt = bot.choose_move(self.board)
         except Exception as e:
             # no moves or error
             self.running = False
@@ -186,16 +182,20 @@ class ChessGUI:
         self.draw_board()
         # include last move in status if available
         if move_obj is not None:
-            self.status.set(f"Move: {self.move_count} | Turn: {self.board.turn.name} | Last: {move_obj}")
+            status = f"Move: {self.move_count} | Turn: {self.board.turn.name} | Last: {move_obj}"
+            # search statistics from bots that report them (Minimaxbot.last_info)
+            info = getattr(bot, 'last_info', None)
+            if info is not None:
+                status += f" | Depth: {info.depth}/{info.seldepth} Score: {info.score} Nodes: {info.total_nodes} NPS: {info.nps:.0f}"
+            self.status.set(status)
         else:
             self.update_status()
 
-        # check for game end: checkmate or stalemate (draw)
-        # After applying a move, if the side to move has no legal moves,
-        # it's either checkmate (if in check) or stalemate.
-        to_move = self.board.turn
-        if self.board.is_checkmate(to_move):
-            winner = to_move.opposite().name
+        # check for game end: checkmate, stalemate, insufficient material or fifty-move rule (draw).
+        # status() generates the legal moves once and caches them for the next bot.
+        status = self.board.status()
+        if status == GameStatus.CHECKMATE:
+            winner = self.board.turn.opposite().name
             self.running = False
             msg = f"Checkmate! Winner: {winner}"
             self.status.set(msg)
@@ -207,9 +207,14 @@ class ChessGUI:
             except Exception as e:
                 print("Failed to show messagebox:", e)
             return
-        if self.board.is_stalemate(to_move):
+        if status != GameStatus.ONGOING:
             self.running = False
-            msg = "Stalemate (draw)"
+            if status == GameStatus.STALEMATE:
+                msg = "Stalemate (draw)"
+            elif self.board.insufficient_material():
+                msg = "Draw: insufficient material"
+            else:
+                msg = "Draw: fifty-move rule"
             self.status.set(msg)
             try:
                 self.root.lift()
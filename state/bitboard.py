@@ -0,0 +1,742 @@
+"""Bitboard-backed position with the same public surface as `state.board.Board`.
+
+Squares are numbered `y * 8 + x` so square 0 is a8 and square 63 is h1, the
+same orientation as `Board.grid[y][x]`. Each of the 12 piece kinds has its own
+64-bit integer, plus one occupancy mask per color and a 64-entry mailbox for
+"what stands on this square" lookups. Like `Board`, it keeps the Zobrist
+`hash` and the `pst_score` up to date on every make / unmake, so the search
+(transposition table, evaluation) runs on it unchanged.
+"""
+
+from .piece import Piece, PieceType, Color
+from .move import Move
+from .board import Board, NextState, GameStatus, FIFTY_MOVE_PLIES
+from .zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
+from .pst import PIECE_SQUARE
+
+# Piece index = color_index * 6 + type_index
+PIECE_TYPES = [PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN, PieceType.KING]
+TYPE_INDEX = {t: i for i, t in enumerate(PIECE_TYPES)}
+COLORS = [Color.WHITE, Color.BLACK]
+COLOR_INDEX = {Color.WHITE: 0, Color.BLACK: 1}
+PIECES = [Piece(t, c) for c in COLORS for t in PIECE_TYPES]
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+EMPTY = -1
+
+# Move flags
+NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE = range(4)
+
+# Castling right bits
+WK, WQ, BK, BQ = 1, 2, 4, 8
+
+# Zobrist keys and PST scores by piece index and square: the same numbers `Board`
+# uses, so both backends give a position the same `hash` and `pst_score`
+ZOBRIST = [PIECE_KEYS[(t, c)] for c in COLORS for t in PIECE_TYPES]
+PST = [PIECE_SQUARE[(t, c)] for c in COLORS for t in PIECE_TYPES]
+
+def _castle_key(rights):
+    key = 0
+    for bit, (color, side) in ((WK, (Color.WHITE, "K")), (WQ, (Color.WHITE, "Q")),
+                               (BK, (Color.BLACK, "K")), (BQ, (Color.BLACK, "Q"))):
+        if rights & bit:
+            key ^= CASTLING_KEYS[color][side]
+    return key
+
+# XOR of the keys of every right in the 4-bit mask
+CASTLE_KEYS = [_castle_key(rights) for rights in range(16)]
+
+def _build_leaper(deltas):
+    table = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        bb = 0
+        for dx, dy in deltas:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < 8 and 0 <= ny < 8:
+                bb |= 1 << (ny * 8 + nx)
+        table.append(bb)
+    return table
+
+KNIGHT_ATTACKS = _build_leaper([(1,2),(2,1),(-1,2),(-2,1),(1,-2),(2,-1),(-1,-2),(-2,-1)])
+KING_ATTACKS = _build_leaper([(1,0),(-1,0),(0,1),(0,-1),(1,1),(-1,1),(1,-1),(-1,-1)])
+# Squares attacked by a pawn of the given color standing on `sq`
+PAWN_ATTACKS = [
+    _build_leaper([(-1,-1),(1,-1)]),   # white pawns move towards y = 0
+    _build_leaper([(-1,1),(1,1)]),
+]
+
+ROOK_DIRS = [(1,0),(-1,0),(0,1),(0,-1)]
+BISHOP_DIRS = [(1,1),(-1,1),(1,-1),(-1,-1)]
+
+def _build_rays(dx, dy):
+    table = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        bb = 0
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < 8 and 0 <= ny < 8:
+            bb |= 1 << (ny * 8 + nx)
+            nx += dx
+            ny += dy
+        table.append(bb)
+    return table
+
+# (rays, positive) per direction; positive rays run towards higher square numbers,
+# so their nearest blocker is the lowest set bit, otherwise the highest.
+ROOK_RAYS = [(_build_rays(dx, dy), dy * 8 + dx > 0) for dx, dy in ROOK_DIRS]
+BISHOP_RAYS = [(_build_rays(dx, dy), dy * 8 + dx > 0) for dx, dy in BISHOP_DIRS]
+
+# Slider attacks on an empty board (candidate pinners / checkers)
+ROOK_EMPTY = [sum(table[sq] for table, _ in ROOK_RAYS) for sq in range(64)]
+BISHOP_EMPTY = [sum(table[sq] for table, _ in BISHOP_RAYS) for sq in range(64)]
+
+def _build_lines():
+    # BETWEEN[a][b]: squares strictly between a and b, LINE[a][b]: the whole line
+    # through both (0 if they do not share a rank, file or diagonal)
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    rays = {d: _build_rays(*d) for d in ROOK_DIRS + BISHOP_DIRS}
+    for a in range(64):
+        for dx, dy in ROOK_DIRS + BISHOP_DIRS:
+            full = (1 << a) | rays[(dx, dy)][a] | rays[(-dx, -dy)][a]
+            x, y = a % 8 + dx, a // 8 + dy
+            passed = 0
+            while 0 <= x < 8 and 0 <= y < 8:
+                b = y * 8 + x
+                between[a][b] = passed
+                line[a][b] = full
+                passed |= 1 << b
+                x += dx
+                y += dy
+    return between, line
+
+BETWEEN, LINE = _build_lines()
+
+FULL = (1 << 64) - 1
+
+def _slider_attacks(sq, occ, rays):
+    att = 0
+    for table, positive in rays:
+        ray = table[sq]
+        blockers = ray & occ
+        if blockers:
+            if positive:
+                b = (blockers & -blockers).bit_length() - 1
+            else:
+                b = blockers.bit_length() - 1
+            ray ^= table[b]
+        att |= ray
+    return att
+
+# AND-ed into the rights whenever a move touches these squares
+CASTLE_MASK = [15] * 64
+CASTLE_MASK[60] = 15 & ~(WK | WQ)   # e1
+CASTLE_MASK[63] = 15 & ~WK          # h1
+CASTLE_MASK[56] = 15 & ~WQ          # a1
+CASTLE_MASK[4] = 15 & ~(BK | BQ)    # e8
+CASTLE_MASK[7] = 15 & ~BK           # h8
+CASTLE_MASK[0] = 15 & ~BQ           # a8
+
+# Rook hop for each castling king destination
+CASTLE_ROOK = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+def _sq(pos):
+    x, y = pos
+    return y * 8 + x
+
+def _pos(sq):
+    return (sq % 8, sq // 8)
+
+POS = [_pos(sq) for sq in range(64)]
+
+class BitMove(Move):
+    """`Move` produced by `BitBoard`; keeps its raw encoding so `make_move` skips the conversion."""
+    __slots__ = ("raw",)
+
+    def __init__(self, raw, piece):
+        frm, to, promo, flag = raw
+        self.frm = POS[frm]
+        self.to = POS[to]
+        self.piece = piece
+        self.promotion = PIECE_TYPES[promo] if promo != EMPTY else None
+        self.en_passant = flag == EN_PASSANT
+        self.castling = flag == CASTLE
+        self.raw = raw
+
+
+class BitBoard:
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occ = [0, 0]
+        self.mailbox = [EMPTY] * 64
+        self.side = 0
+        self.castle_rights = WK | WQ | BK | BQ
+        self.ep = EMPTY
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._legal_cache = None
+        self._init()
+        self._rehash()
+
+    def _init(self):
+        back = [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
+        for x in range(8):
+            self._put(x, back[x], 1)
+            self._put(8 + x, PAWN, 1)
+            self._put(48 + x, PAWN, 0)
+            self._put(56 + x, back[x], 0)
+
+    def _rehash(self):
+        """Recompute `hash` and `pst_score` from scratch (make/unmake keep them up to date)."""
+        h = 0
+        score = 0
+        for sq, idx in enumerate(self.mailbox):
+            if idx != EMPTY:
+                h ^= ZOBRIST[idx][sq]
+                score += PST[idx][sq]
+        h ^= CASTLE_KEYS[self.castle_rights]
+        if self.ep != EMPTY:
+            h ^= EN_PASSANT_KEYS[self.ep & 7]
+        if self.side:
+            h ^= SIDE_KEY
+        self.hash = h
+        self.pst_score = score
+
+    def _put(self, sq, t, color):
+        idx = color * 6 + t
+        bb = 1 << sq
+        self.pieces[idx] |= bb
+        self.occ[color] |= bb
+        self.mailbox[sq] = idx
+
+    @classmethod
+    def from_board(cls, board: Board) -> "BitBoard":
+        bb = cls.__new__(cls)
+        bb.pieces = [0] * 12
+        bb.occ = [0, 0]
+        bb.mailbox = [EMPTY] * 64
+        for y in range(8):
+            for x in range(8):
+                p = board.grid[y][x]
+                if p is not None:
+                    bb._put(y * 8 + x, TYPE_INDEX[p.type], COLOR_INDEX[p.color])
+        bb.side = COLOR_INDEX[board.turn]
+        rights = 0
+        if board.castling[Color.WHITE]["K"]: rights |= WK
+        if board.castling[Color.WHITE]["Q"]: rights |= WQ
+        if board.castling[Color.BLACK]["K"]: rights |= BK
+        if board.castling[Color.BLACK]["Q"]: rights |= BQ
+        bb.castle_rights = rights
+        bb.ep = _sq(board.en_passant) if board.en_passant else EMPTY
+        bb.halfmove_clock = board.halfmove_clock
+        bb.fullmove_number = board.fullmove_number
+        bb._legal_cache = None
+        bb._rehash()
+        return bb
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "BitBoard":
+        return cls.from_board(Board.from_fen(fen))
+
+    def to_board(self) -> Board:
+        board = Board.__new__(Board)
+        board.grid = self.grid
+        board.turn = self.turn
+        board.en_passant = _pos(self.ep) if self.ep != EMPTY else None
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.castling = {
+            Color.WHITE: {"K": bool(self.castle_rights & WK), "Q": bool(self.castle_rights & WQ)},
+            Color.BLACK: {"K": bool(self.castle_rights & BK), "Q": bool(self.castle_rights & BQ)},
+        }
+        board._index_pieces()
+        return board
+
+    def copy(self):
+        newb = BitBoard.__new__(BitBoard)
+        newb.pieces = self.pieces[:]
+        newb.occ = self.occ[:]
+        newb.mailbox = self.mailbox[:]
+        newb.side = self.side
+        newb.castle_rights = self.castle_rights
+        newb.ep = self.ep
+        newb.halfmove_clock = self.halfmove_clock
+        newb.fullmove_number = self.fullmove_number
+        newb.hash = self.hash
+        newb.pst_score = self.pst_score
+        newb._legal_cache = self._legal_cache
+        return newb
+
+    @property
+    def turn(self) -> Color:
+        return COLORS[self.side]
+
+    @property
+    def grid(self):
+        """`Board`-style 8x8 view, rebuilt on every access."""
+        mb = self.mailbox
+        return [[PIECES[mb[y * 8 + x]] if mb[y * 8 + x] != EMPTY else None for x in range(8)] for y in range(8)]
+
+    def get(self, pos):
+        idx = self.mailbox[pos[1] * 8 + pos[0]]
+        return PIECES[idx] if idx != EMPTY else None
+
+    def printBoard(self):
+        self.to_board().printBoard()
+
+    # ---------- CHECK DETECTION ----------
+    def _attacked(self, sq, by, occ):
+        """True if side `by` (0 white, 1 black) attacks square `sq` with occupancy `occ`."""
+        p = self.pieces
+        base = by * 6
+        if KNIGHT_ATTACKS[sq] & p[base + KNIGHT]:
+            return True
+        if PAWN_ATTACKS[by ^ 1][sq] & p[base + PAWN]:
+            return True
+        if KING_ATTACKS[sq] & p[base + KING]:
+            return True
+        diag = p[base + BISHOP] | p[base + QUEEN]
+        if diag and _slider_attacks(sq, occ, BISHOP_RAYS) & diag:
+            return True
+        straight = p[base + ROOK] | p[base + QUEEN]
+        if straight and _slider_attacks(sq, occ, ROOK_RAYS) & straight:
+            return True
+        return False
+
+    def _attackers(self, sq, by, occ):
+        """Bitboard of the pieces of side `by` attacking square `sq`."""
+        p = self.pieces
+        base = by * 6
+        return (
+            (KNIGHT_ATTACKS[sq] & p[base + KNIGHT])
+            | (PAWN_ATTACKS[by ^ 1][sq] & p[base + PAWN])
+            | (KING_ATTACKS[sq] & p[base + KING])
+            | (_slider_attacks(sq, occ, BISHOP_RAYS) & (p[base + BISHOP] | p[base + QUEEN]))
+            | (_slider_attacks(sq, occ, ROOK_RAYS) & (p[base + ROOK] | p[base + QUEEN]))
+        )
+
+    def _king_attacked(self, side):
+        king = self.pieces[side * 6 + KING]
+        return self._attacked(king.bit_length() - 1, side ^ 1, self.occ[0] | self.occ[1])
+
+    def square_attacked(self, pos, by_color):
+        return self._attacked(_sq(pos), COLOR_INDEX[by_color], self.occ[0] | self.occ[1])
+
+    def is_in_check(self, color):
+        return self._king_attacked(COLOR_INDEX[color])
+
+    # ---------- MAKE / UNMAKE ----------
+    def _make(self, raw):
+        frm, to, promo, flag = raw
+        side = self.side
+        p = self.pieces
+        occ = self.occ
+        mb = self.mailbox
+
+        idx = mb[frm]
+        cap_sq = to
+        if flag == EN_PASSANT:
+            cap_sq = to + 8 if side == 0 else to - 8
+        cap = mb[cap_sq]
+        rights = self.castle_rights
+        h = self.hash
+        score = self.pst_score
+        undo = (raw, idx, cap, cap_sq, rights, self.ep, h, score, self.halfmove_clock)
+
+        from_bb = 1 << frm
+        to_bb = 1 << to
+        p[idx] ^= from_bb
+        occ[side] ^= from_bb
+        mb[frm] = EMPTY
+        h ^= ZOBRIST[idx][frm]
+        score -= PST[idx][frm]
+        if cap != EMPTY:
+            cap_bb = 1 << cap_sq
+            p[cap] ^= cap_bb
+            occ[side ^ 1] ^= cap_bb
+            mb[cap_sq] = EMPTY
+            h ^= ZOBRIST[cap][cap_sq]
+            score -= PST[cap][cap_sq]
+            self.halfmove_clock = 0
+        elif idx == side * 6 + PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        new_idx = idx if promo == EMPTY else side * 6 + promo
+        p[new_idx] |= to_bb
+        occ[side] |= to_bb
+        mb[to] = new_idx
+        h ^= ZOBRIST[new_idx][to]
+        score += PST[new_idx][to]
+
+        if flag == CASTLE:
+            rf, rt = CASTLE_ROOK[to]
+            rook = side * 6 + ROOK
+            hop = (1 << rf) | (1 << rt)
+            p[rook] ^= hop
+            occ[side] ^= hop
+            mb[rf] = EMPTY
+            mb[rt] = rook
+            h ^= ZOBRIST[rook][rf] ^ ZOBRIST[rook][rt]
+            score += PST[rook][rt] - PST[rook][rf]
+
+        new_rights = rights & CASTLE_MASK[frm] & CASTLE_MASK[to]
+        if new_rights != rights:
+            h ^= CASTLE_KEYS[rights] ^ CASTLE_KEYS[new_rights]
+            self.castle_rights = new_rights
+        if self.ep != EMPTY:
+            h ^= EN_PASSANT_KEYS[self.ep & 7]
+        if flag == DOUBLE_PUSH:
+            self.ep = (frm + to) >> 1
+            h ^= EN_PASSANT_KEYS[self.ep & 7]
+        else:
+            self.ep = EMPTY
+        if side:
+            self.fullmove_number += 1
+        self.side = side ^ 1
+        self.hash = h ^ SIDE_KEY
+        self.pst_score = score
+        return undo
+
+    def _unmake(self, undo):
+        raw, idx, cap, cap_sq, rights, ep, h, score, halfmove_clock = undo
+        frm, to, promo, flag = raw
+        side = self.side ^ 1
+        p = self.pieces
+        occ = self.occ
+        mb = self.mailbox
+
+        self.side = side
+        self.castle_rights = rights
+        self.ep = ep
+        self.hash = h
+        self.pst_score = score
+        self.halfmove_clock = halfmove_clock
+        if side:
+            self.fullmove_number -= 1
+
+        if flag == CASTLE:
+            rf, rt = CASTLE_ROOK[to]
+            rook = side * 6 + ROOK
+            hop = (1 << rf) | (1 << rt)
+            p[rook] ^= hop
+            occ[side] ^= hop
+            mb[rt] = EMPTY
+            mb[rf] = rook
+
+        from_bb = 1 << frm
+        to_bb = 1 << to
+        p[mb[to]] ^= to_bb
+        occ[side] ^= to_bb
+        mb[to] = EMPTY
+        p[idx] |= from_bb
+        occ[side] |= from_bb
+        mb[frm] = idx
+        if cap != EMPTY:
+            cap_bb = 1 << cap_sq
+            p[cap] |= cap_bb
+            occ[side ^ 1] |= cap_bb
+            mb[cap_sq] = cap
+
+    def _to_raw(self, move: Move):
+        frm = _sq(move.frm)
+        to = _sq(move.to)
+        promo = TYPE_INDEX[move.promotion] if move.promotion else EMPTY
+        if move.castling:
+            flag = CASTLE
+        elif move.en_passant:
+            flag = EN_PASSANT
+        elif move.piece.type == PieceType.PAWN and abs(move.to[1] - move.frm[1]) == 2:
+            flag = DOUBLE_PUSH
+        else:
+            flag = NORMAL
+        return (frm, to, promo, flag)
+
+    def _to_move(self, raw):
+        return BitMove(raw, PIECES[self.mailbox[raw[0]]])
+
+    def make_move(self, move: Move):
+        """Apply `move` in place and return the undo record for `unmake_move`."""
+        self._legal_cache = None
+        try:
+            raw = move.raw
+        except AttributeError:
+            raw = self._to_raw(move)
+        return self._make(raw)
+
+    def unmake_move(self, undo) -> None:
+        self._legal_cache = None
+        self._unmake(undo)
+
+    # ---------- MOVE GENERATION ----------
+    def _legal_raw_moves(self, captures_only=False):
+        return list(self._iter_raw_moves(captures_only))
+
+    def _iter_raw_moves(self, captures_only=False):
+        """Yield the legal moves as raw (from, to, promotion, flag) tuples.
+
+        Like `Board.generate_moves`, check evasions and pins are handled with
+        masks (a pinned piece keeps to the line through its king); only king
+        moves test the destination square, and only en-passant is played out.
+        With `captures_only`, quiet moves are dropped (promotions are kept).
+        King moves come first. Like `Board.iter_moves`, the caller may make a
+        yielded move but must unmake it before asking for the next one.
+        """
+        side = self.side
+        enemy_side = side ^ 1
+        p = self.pieces
+        own = self.occ[side]
+        enemy = self.occ[enemy_side]
+        occ = own | enemy
+        base = side * 6
+        ebase = enemy_side * 6
+
+        # King: the king itself must not block the attack on its destination
+        king_bb = p[base + KING]
+        k = king_bb.bit_length() - 1
+        targets = KING_ATTACKS[k] & (enemy if captures_only else ~own)
+        without_king = occ ^ king_bb
+        while targets:
+            t = targets & -targets
+            targets ^= t
+            to = t.bit_length() - 1
+            if not self._attacked(to, enemy_side, without_king):
+                yield (k, to, EMPTY, NORMAL)
+
+        checkers = self._attackers(k, enemy_side, occ)
+        if checkers & (checkers - 1):
+            return              # Double check: only the king can move
+        if checkers:
+            # Capture the checker or block the line
+            allowed = checkers | BETWEEN[k][checkers.bit_length() - 1]
+        else:
+            allowed = FULL
+            if not captures_only:
+                castles = []
+                self._castle_moves(k, occ, castles)
+                yield from castles
+
+        # Own pieces alone between the king and an enemy slider are pinned
+        pinned = 0
+        between = BETWEEN[k]
+        snipers = (ROOK_EMPTY[k] & (p[ebase + ROOK] | p[ebase + QUEEN])) | \
+                  (BISHOP_EMPTY[k] & (p[ebase + BISHOP] | p[ebase + QUEEN]))
+        while snipers:
+            s = snipers & -snipers
+            snipers ^= s
+            b = between[s.bit_length() - 1] & occ
+            if b and not b & (b - 1) and b & own:
+                pinned |= b
+        line = LINE[k]
+        target_mask = allowed & (enemy if captures_only else ~own)
+
+        # Pawns
+        bb = p[base + PAWN]
+        empty = ~occ
+        step = -8 if side == 0 else 8
+        start_lo, start_hi = (48, 56) if side == 0 else (8, 16)
+        promo_lo, promo_hi = (0, 8) if side == 0 else (56, 64)
+        attacks_tbl = PAWN_ATTACKS[side]
+        ep = self.ep
+        while bb:
+            lsb = bb & -bb
+            frm = lsb.bit_length() - 1
+            bb ^= lsb
+            mask = allowed & line[frm] if pinned & lsb else allowed
+            one = frm + step
+            if (empty >> one) & 1:
+                if promo_lo <= one < promo_hi:
+                    if (mask >> one) & 1:
+                        for promo in (QUEEN, ROOK, BISHOP, KNIGHT):
+                            yield (frm, one, promo, NORMAL)
+                elif not captures_only:
+                    if (mask >> one) & 1:
+                        yield (frm, one, EMPTY, NORMAL)
+                    two = one + step
+                    if start_lo <= frm < start_hi and (empty >> two) & 1 and (mask >> two) & 1:
+                        yield (frm, two, EMPTY, DOUBLE_PUSH)
+            caps = attacks_tbl[frm] & enemy & mask
+            while caps:
+                c = caps & -caps
+                caps ^= c
+                to = c.bit_length() - 1
+                if promo_lo <= to < promo_hi:
+                    for promo in (QUEEN, ROOK, BISHOP, KNIGHT):
+                        yield (frm, to, promo, NORMAL)
+                else:
+                    yield (frm, to, EMPTY, NORMAL)
+            if ep != EMPTY and (attacks_tbl[frm] >> ep) & 1:
+                # Both pawns leave the rank at once, so play it out
+                raw = (frm, ep, EMPTY, EN_PASSANT)
+                undo = self._make(raw)
+                legal = not self._king_attacked(side)
+                self._unmake(undo)
+                if legal:
+                    yield raw
+
+        # Knights (a pinned knight can never move)
+        bb = p[base + KNIGHT] & ~pinned
+        while bb:
+            lsb = bb & -bb
+            frm = lsb.bit_length() - 1
+            bb ^= lsb
+            targets = KNIGHT_ATTACKS[frm] & target_mask
+            while targets:
+                t = targets & -targets
+                targets ^= t
+                yield (frm, t.bit_length() - 1, EMPTY, NORMAL)
+
+        # Sliders
+        for kind, rays in ((BISHOP, BISHOP_RAYS), (ROOK, ROOK_RAYS), (QUEEN, None)):
+            bb = p[base + kind]
+            while bb:
+                lsb = bb & -bb
+                frm = lsb.bit_length() - 1
+                bb ^= lsb
+                if rays is None:
+                    targets = _slider_attacks(frm, occ, BISHOP_RAYS) | _slider_attacks(frm, occ, ROOK_RAYS)
+                else:
+                    targets = _slider_attacks(frm, occ, rays)
+                targets &= target_mask
+                if pinned & lsb:
+                    targets &= line[frm]
+                while targets:
+                    t = targets & -targets
+                    targets ^= t
+                    yield (frm, t.bit_length() - 1, EMPTY, NORMAL)
+
+
+    def _castle_moves(self, frm, occ, out):
+        side = self.side
+        rights = self.castle_rights
+        enemy = side ^ 1
+        if side == 0:
+            k_right, q_right, row = WK, WQ, 56
+        else:
+            k_right, q_right, row = BK, BQ, 0
+        if frm != row + 4:
+            return
+        attacked = self._attacked
+        if rights & k_right:
+            if not (occ >> (row + 5)) & 1 and not (occ >> (row + 6)) & 1 and (occ >> (row + 7)) & 1:
+                if not attacked(row + 5, enemy, occ) and not attacked(row + 6, enemy, occ):
+                    out.append((frm, row + 6, EMPTY, CASTLE))
+        if rights & q_right:
+            if not (occ >> (row + 1)) & 1 and not (occ >> (row + 2)) & 1 and not (occ >> (row + 3)) & 1 and occ & (1 << row):
+                if not attacked(row + 3, enemy, occ) and not attacked(row + 2, enemy, occ):
+                    out.append((frm, row + 2, EMPTY, CASTLE))
+
+    def generate_moves(self):
+        """Return the legal moves for the side to move as `Move` objects.
+
+        The list is cached until the next make / unmake (see `Board.generate_moves`).
+        """
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.side:
+            return list(cached[1])
+        mb = self.mailbox
+        moves = [BitMove(raw, PIECES[mb[raw[0]]]) for raw in self._legal_raw_moves()]
+        self._legal_cache = (self.side, moves)
+        return list(moves)
+
+    def _is_tactical_raw(self, raw):
+        return self.mailbox[raw[1]] != EMPTY or raw[2] != EMPTY or raw[3] == EN_PASSANT
+
+    def generate_captures(self):
+        """Legal captures and promotions only (for quiescence search)."""
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.side:
+            return [m for m in cached[1] if self._is_tactical_raw(m.raw)]
+        mb = self.mailbox
+        return [BitMove(raw, PIECES[mb[raw[0]]]) for raw in self._legal_raw_moves(captures_only=True)]
+
+    def iter_moves(self, staged=True):
+        """Yield legal moves one at a time (see `Board.iter_moves`).
+
+        Uses the cached list when there is one, otherwise generates lazily:
+        with `staged`, captures and promotions are yielded as they are found
+        and quiet moves are held back until the end.
+        """
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.side:
+            moves = cached[1]
+            if staged:
+                tactical = self._is_tactical_raw
+                moves = [m for m in moves if tactical(m.raw)] + [m for m in moves if not tactical(m.raw)]
+            yield from moves
+            return
+        quiets = []
+        for raw in self._iter_raw_moves():
+            if staged and not self._is_tactical_raw(raw):
+                quiets.append(raw)
+                continue
+            yield self._to_move(raw)
+        for raw in quiets:
+            yield self._to_move(raw)
+
+    def has_legal_move(self) -> bool:
+        """True if the side to move has a legal move; stops at the first one found."""
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.side:
+            return bool(cached[1])
+        return next(self._iter_raw_moves(), None) is not None
+
+    def generate_next_states(self):
+        out = []
+        for move in self.generate_moves():
+            newb = self.copy()
+            newb._make(move.raw)
+            newb._legal_cache = None
+            out.append(NextState(board=newb, move=move))
+        return out
+
+    def iter_next_states(self, staged=True):
+        """Lazy `generate_next_states`: each child board is built only when requested."""
+        for move in self.iter_moves(staged):
+            newb = self.copy()
+            newb.make_move(move)
+            yield NextState(board=newb, move=move)
+
+    # ---------- MOVE AVAILABILITY / GAME END ----------
+    def _has_legal_moves_for(self, color: Color) -> bool:
+        cur_side = self.side
+        try:
+            self.side = COLOR_INDEX[color]
+            return self.has_legal_move()
+        finally:
+            self.side = cur_side
+
+    def status(self) -> GameStatus:
+        """State of the game for the side to move (see `Board.status`).
+
+        Generates the legal moves once; a following `generate_moves` call
+        reuses them from the cache.
+        """
+        if self.generate_moves():
+            if self.halfmove_clock >= FIFTY_MOVE_PLIES or self.insufficient_material():
+                return GameStatus.DRAW
+            return GameStatus.ONGOING
+        if self._king_attacked(self.side):
+            return GameStatus.CHECKMATE
+        return GameStatus.STALEMATE
+
+    def insufficient_material(self) -> bool:
+        p = self.pieces
+        for c in (0, 6):
+            if p[c + PAWN] or p[c + ROOK] or p[c + QUEEN]:
+                return False
+        minors = sum(bin(p[c + t]).count("1") for c in (0, 6) for t in (KNIGHT, BISHOP))
+        return minors <= 1
+
+    def is_checkmate(self, color: Color) -> bool:
+        """True if `color` is checkmated (in check and no legal moves)."""
+        if not self.is_in_check(color):
+            return False
+        return not self._has_legal_moves_for(color)
+
+    def is_stalemate(self, color: Color) -> bool:
+        """True if `color` has no legal moves but is not in check (stalemate)."""
+        if self.is_in_check(color):
+            return False
+        return not self._has_legal_moves_for(color)
@@ -1,14 +1,63 @@
-from copy import deepcopy
+import re
 from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
 
-from .piece import Piece, PieceType, Color
-from .move import Move
+from .piece import Piece, PieceType, Color, MATERIAL_VALUES
+from .move import Move, PROMOTION_LETTERS, square_name
+from .zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
+from .pst import PIECE_SQUARE
 
 @dataclass
 class NextState:
     board: "Board"
     move: Move
-    
+
+@dataclass
+class Undo:
+    """Everything `Board.unmake_move` needs to restore the previous position."""
+    move: Move
+    piece: Piece
+    captured: Optional[Piece]
+    captured_pos: Optional[tuple[int, int]]
+    castling: tuple[bool, bool, bool, bool]
+    en_passant: Optional[tuple[int, int]]
+    hash: int
+    halfmove_clock: int = 0
+
+class GameStatus(Enum):
+    ONGOING = "ONGOING"
+    CHECKMATE = "CHECKMATE"     # side to move is mated
+    STALEMATE = "STALEMATE"
+    DRAW = "DRAW"               # insufficient material or fifty-move rule
+
+# Corner squares whose rook gives the castling right (color, side)
+ROOK_CORNERS = {
+    (7, 7): (Color.WHITE, "K"),
+    (0, 7): (Color.WHITE, "Q"),
+    (7, 0): (Color.BLACK, "K"),
+    (0, 0): (Color.BLACK, "Q"),
+}
+
+PROMOTION_TYPES = [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT]
+
+FEN_PIECES = {
+    "p": PieceType.PAWN,
+    "n": PieceType.KNIGHT,
+    "b": PieceType.BISHOP,
+    "r": PieceType.ROOK,
+    "q": PieceType.QUEEN,
+    "k": PieceType.KING,
+}
+FEN_LETTERS = {t: ch for ch, t in FEN_PIECES.items()}
+SAN_PIECES = {ch.upper(): t for ch, t in FEN_PIECES.items() if ch != "p"}
+
+# [piece][from file][from rank][x]to[=promotion]
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?$")
+
+# Half-moves without a pawn move or capture before the game is drawn
+FIFTY_MOVE_PLIES = 100
+
 class Board:
     def __init__(self):
         self.grid = [[None for _ in range(8)] for _ in range(8)]
@@ -18,7 +67,10 @@ class Board:
             Color.WHITE: {"K": True, "Q": True},
             Color.BLACK: {"K": True, "Q": True},
         }
+        self.halfmove_clock = 0     # ply tu lan di tot / an quan gan nhat (luat 50 nuoc)
+        self.fullmove_number = 1
         self._init()
+        self._index_pieces()
 
     def _init(self):
         for x in range(8):
@@ -40,8 +92,176 @@ class Board:
         self.grid[0][4] = Piece(PieceType.KING, Color.BLACK)
         self.grid[7][4] = Piece(PieceType.KING, Color.WHITE)
 
+    @classmethod
+    def from_fen(cls, fen: str) -> "Board":
+        """Build a board from a FEN string. The move clocks are optional (EPD) and default to "0 1".
+
+        Raises ValueError for malformed input, including a bad en-passant square
+        and a side without exactly one king.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"Invalid FEN: {fen!r}")
+        placement, side, castling, en_passant = fields[:4]
+
+        board = cls.__new__(cls)
+        board.grid = [[None for _ in range(8)] for _ in range(8)]
+        rows = placement.split("/")
+        if len(rows) != 8:
+            raise ValueError(f"Invalid FEN placement: {placement!r}")
+        for y, row in enumerate(rows):
+            x = 0
+            for ch in row:
+                if ch.isdigit():
+                    x += int(ch)
+                elif ch.lower() in FEN_PIECES and x < 8:
+                    color = Color.WHITE if ch.isupper() else Color.BLACK
+                    board.grid[y][x] = Piece(FEN_PIECES[ch.lower()], color)
+                    x += 1
+                else:
+                    raise ValueError(f"Invalid FEN placement: {placement!r}")
+            if x != 8:
+                raise ValueError(f"Invalid FEN placement: {placement!r}")
+
+        if side not in ("w", "b"):
+            raise ValueError(f"Invalid FEN side to move: {side!r}")
+        board.turn = Color.WHITE if side == "w" else Color.BLACK
+        board.castling = {
+            Color.WHITE: {"K": "K" in castling, "Q": "Q" in castling},
+            Color.BLACK: {"K": "k" in castling, "Q": "q" in castling},
+        }
+        if en_passant == "-":
+            board.en_passant = None
+        elif len(en_passant) == 2 and en_passant[0] in "abcdefgh" and en_passant[1] in "36":
+            board.en_passant = (ord(en_passant[0]) - ord("a"), 8 - int(en_passant[1]))
+        else:
+            raise ValueError(f"Invalid FEN en-passant square: {en_passant!r}")
+        try:
+            board.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+            board.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise ValueError(f"Invalid FEN move clocks: {fen!r}") from None
+        for color in (Color.WHITE, Color.BLACK):
+            kings = sum(p == Piece(PieceType.KING, color) for row in board.grid for p in row)
+            if kings != 1:
+                raise ValueError(f"Invalid FEN: {color.name.lower()} has {kings} kings: {fen!r}")
+        board._index_pieces()
+        return board
+
+    def to_fen(self) -> str:
+        """FEN string of the position, including the move clocks."""
+        rows = []
+        for row in self.grid:
+            out = ""
+            empty = 0
+            for p in row:
+                if p is None:
+                    empty += 1
+                    continue
+                if empty:
+                    out += str(empty)
+                    empty = 0
+                ch = FEN_LETTERS[p.type]
+                out += ch.upper() if p.color == Color.WHITE else ch
+            if empty:
+                out += str(empty)
+            rows.append(out)
+        castling = "".join(
+            ch for ch, (color, side) in zip("KQkq", [
+                (Color.WHITE, "K"), (Color.WHITE, "Q"), (Color.BLACK, "K"), (Color.BLACK, "Q"),
+            ]) if self.castling[color][side]
+        ) or "-"
+        en_passant = square_name(self.en_passant) if self.en_passant else "-"
+        side = "w" if self.turn == Color.WHITE else "b"
+        return f"{'/'.join(rows)} {side} {castling} {en_passant} {self.halfmove_clock} {self.fullmove_number}"
+
+    def _index_pieces(self):
+        """Rebuild king squares, piece lists, material, PST score and the Zobrist hash.
+
+        Only needed after writing `grid` (or turn / castling / en_passant)
+        directly; `make_move` / `unmake_move` keep everything up to date
+        incrementally.
+        """
+        self.king_pos = {Color.WHITE: None, Color.BLACK: None}
+        self.piece_lists = {Color.WHITE: {}, Color.BLACK: {}}
+        self.material = {Color.WHITE: 0, Color.BLACK: 0}
+        self.pst_score = 0
+        self._hash = 0
+        self._legal_cache = None
+        for y in range(8):
+            for x in range(8):
+                p = self.grid[y][x]
+                if p is not None:
+                    self._place(x, y, p)
+        for color, rights in self.castling.items():
+            for side, allowed in rights.items():
+                if allowed:
+                    self._hash ^= CASTLING_KEYS[color][side]
+        if self.en_passant:
+            self._hash ^= EN_PASSANT_KEYS[self.en_passant[0]]
+        if self.turn == Color.BLACK:
+            self._hash ^= SIDE_KEY
+
+    def _place(self, x, y, piece):
+        self.grid[y][x] = piece
+        self.piece_lists[piece.color][(x, y)] = piece
+        self.material[piece.color] += MATERIAL_VALUES[piece.type]
+        self.pst_score += PIECE_SQUARE[(piece.type, piece.color)][y * 8 + x]
+        self._hash ^= PIECE_KEYS[(piece.type, piece.color)][y * 8 + x]
+        if piece.type == PieceType.KING:
+            self.king_pos[piece.color] = (x, y)
+
+    def _remove(self, x, y):
+        piece = self.grid[y][x]
+        self.grid[y][x] = None
+        del self.piece_lists[piece.color][(x, y)]
+        self.material[piece.color] -= MATERIAL_VALUES[piece.type]
+        self.pst_score -= PIECE_SQUARE[(piece.type, piece.color)][y * 8 + x]
+        self._hash ^= PIECE_KEYS[(piece.type, piece.color)][y * 8 + x]
+        return piece
+
+    @property
+    def hash(self) -> int:
+        """64-bit Zobrist key of the position (pieces, side to move, castling, en-passant)."""
+        return self._hash
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.turn == other.turn
+            and self.en_passant == other.en_passant
+            and self.castling == other.castling
+            and self.grid == other.grid
+        )
+
     def copy(self):
-        return deepcopy(self)
+        # Pieces are never mutated, so rows can share them.
+        newb = Board.__new__(Board)
+        newb.grid = [row[:] for row in self.grid]
+        newb.turn = self.turn
+        newb.en_passant = self.en_passant
+        newb.halfmove_clock = self.halfmove_clock
+        newb.fullmove_number = self.fullmove_number
+        newb.castling = {
+            Color.WHITE: dict(self.castling[Color.WHITE]),
+            Color.BLACK: dict(self.castling[Color.BLACK]),
+        }
+        newb.king_pos = dict(self.king_pos)
+        newb.piece_lists = {
+            Color.WHITE: dict(self.piece_lists[Color.WHITE]),
+            Color.BLACK: dict(self.piece_lists[Color.BLACK]),
+        }
+        newb.material = dict(self.material)
+        newb.pst_score = self.pst_score
+        newb._hash = self._hash
+        # Same position, so the cached legal moves stay valid
+        newb._legal_cache = self._legal_cache
+        return newb
 
     def inside(self, x, y):
         return 0 <= x < 8 and 0 <= y < 8
@@ -75,17 +295,10 @@ class Board:
             print("|")
         print("   +------------------------+")
         print("     a  b  c  d  e  f  g  h\n")
-    
+
     # ---------- CHECK DETECTION ----------
     def is_in_check(self, color):
-        king_pos = None
-        for y in range(8):
-            for x in range(8):
-                p = self.grid[y][x]
-                if p and p.type == PieceType.KING and p.color == color:
-                    king_pos = (x, y)
-                    break
-
+        king_pos = self.king_pos[color]
         enemy = color.opposite()
         return self.square_attacked(king_pos, enemy)
 
@@ -138,26 +351,324 @@ class Board:
 
         return False
 
+    # ---------- MAKE / UNMAKE ----------
+    def make_move(self, move: Move) -> Undo:
+        """Apply `move` in place and return the record needed to take it back."""
+        fx, fy = move.frm
+        tx, ty = move.to
+        piece = self.grid[fy][fx]
+        color = piece.color
+
+        if move.en_passant:
+            captured_pos = (tx, fy)
+        else:
+            captured_pos = (tx, ty)
+        captured = self.grid[captured_pos[1]][captured_pos[0]]
+
+        undo = Undo(
+            move=move,
+            piece=piece,
+            captured=captured,
+            captured_pos=captured_pos if captured else None,
+            castling=(
+                self.castling[Color.WHITE]["K"], self.castling[Color.WHITE]["Q"],
+                self.castling[Color.BLACK]["K"], self.castling[Color.BLACK]["Q"],
+            ),
+            en_passant=self.en_passant,
+            hash=self._hash,
+            halfmove_clock=self.halfmove_clock,
+        )
+        self._legal_cache = None
+        if captured or piece.type == PieceType.PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if color == Color.BLACK:
+            self.fullmove_number += 1
+
+        if captured:
+            self._remove(captured_pos[0], captured_pos[1])
+        self._remove(fx, fy)
+        if move.promotion:
+            self._place(tx, ty, Piece(move.promotion, color))
+        else:
+            self._place(tx, ty, piece)
+
+        if move.castling:
+            # Rook jumps over the king: h-file -> f-file or a-file -> d-file
+            rx, rdx = (7, 5) if tx == 6 else (0, 3)
+            self._place(rdx, ty, self._remove(rx, ty))
+
+        # Castling rights: king moves, rook leaves its corner, rook captured on its corner
+        if piece.type == PieceType.KING:
+            self.castling[color]["K"] = False
+            self.castling[color]["Q"] = False
+        corner = ROOK_CORNERS.get(move.frm)
+        if corner:
+            self.castling[corner[0]][corner[1]] = False
+        corner = ROOK_CORNERS.get(move.to)
+        if corner:
+            self.castling[corner[0]][corner[1]] = False
+        wk, wq, bk, bq = undo.castling
+        if wk and not self.castling[Color.WHITE]["K"]:
+            self._hash ^= CASTLING_KEYS[Color.WHITE]["K"]
+        if wq and not self.castling[Color.WHITE]["Q"]:
+            self._hash ^= CASTLING_KEYS[Color.WHITE]["Q"]
+        if bk and not self.castling[Color.BLACK]["K"]:
+            self._hash ^= CASTLING_KEYS[Color.BLACK]["K"]
+        if bq and not self.castling[Color.BLACK]["Q"]:
+            self._hash ^= CASTLING_KEYS[Color.BLACK]["Q"]
+
+        if self.en_passant:
+            self._hash ^= EN_PASSANT_KEYS[self.en_passant[0]]
+        if piece.type == PieceType.PAWN and abs(ty - fy) == 2:
+            self.en_passant = (fx, (fy + ty) // 2)
+            self._hash ^= EN_PASSANT_KEYS[fx]
+        else:
+            self.en_passant = None
+
+        self.turn = self.turn.opposite()
+        self._hash ^= SIDE_KEY
+        return undo
+
+    def unmake_move(self, undo: Undo) -> None:
+        """Take back the move recorded in `undo` (must be the last one made)."""
+        move = undo.move
+        fx, fy = move.frm
+        tx, ty = move.to
+
+        self.turn = self.turn.opposite()
+        self.en_passant = undo.en_passant
+        self._legal_cache = None
+        self.halfmove_clock = undo.halfmove_clock
+        if self.turn == Color.BLACK:
+            self.fullmove_number -= 1
+        wk, wq, bk, bq = undo.castling
+        self.castling[Color.WHITE]["K"] = wk
+        self.castling[Color.WHITE]["Q"] = wq
+        self.castling[Color.BLACK]["K"] = bk
+        self.castling[Color.BLACK]["Q"] = bq
+
+        if move.castling:
+            rx, rdx = (7, 5) if tx == 6 else (0, 3)
+            self._place(rx, ty, self._remove(rdx, ty))
+
+        self._remove(tx, ty)
+        self._place(fx, fy, undo.piece)
+        if undo.captured:
+            cx, cy = undo.captured_pos
+            self._place(cx, cy, undo.captured)
+        self._hash = undo.hash
+
+    # ---------- PINS / CHECKS ----------
+    def pins_and_checks(self, color):
+        """Scan outwards from `color`'s king once.
+
+        Returns `(checkers, check_mask, pins)`: the number of pieces giving
+        check, the squares a non-king move must land on to resolve a single
+        check (capture the checker or block its ray), and a dict mapping each
+        pinned piece's square to the direction of its pin.
+        """
+        kx, ky = self.king_pos[color]
+        enemy = color.opposite()
+        checkers = 0
+        check_mask = set()
+        pins = {}
+
+        for dx, dy in [(1,0),(-1,0),(0,1),(0,-1),(1,1),(-1,1),(1,-1),(-1,-1)]:
+            diagonal = dx != 0 and dy != 0
+            ray = []
+            own = None
+            nx, ny = kx + dx, ky + dy
+            while self.inside(nx, ny):
+                ray.append((nx, ny))
+                p = self.grid[ny][nx]
+                if p:
+                    if p.color == color:
+                        if own:
+                            break
+                        own = (nx, ny)
+                    else:
+                        slides_here = p.type == PieceType.QUEEN or p.type == (PieceType.BISHOP if diagonal else PieceType.ROOK)
+                        if slides_here:
+                            if own:
+                                pins[own] = (dx, dy)
+                            else:
+                                checkers += 1
+                                check_mask = set(ray)
+                        break
+                nx += dx
+                ny += dy
+
+        for dx, dy in [(1,2),(2,1),(-1,2),(-2,1),(1,-2),(2,-1),(-1,-2),(-2,-1)]:
+            nx, ny = kx + dx, ky + dy
+            if self.inside(nx, ny):
+                p = self.grid[ny][nx]
+                if p and p.color == enemy and p.type == PieceType.KNIGHT:
+                    checkers += 1
+                    check_mask = {(nx, ny)}
+
+        dirp = -1 if color == Color.WHITE else 1
+        for dx in (-1, 1):
+            nx, ny = kx + dx, ky + dirp
+            if self.inside(nx, ny):
+                p = self.grid[ny][nx]
+                if p and p.color == enemy and p.type == PieceType.PAWN:
+                    checkers += 1
+                    check_mask = {(nx, ny)}
+
+        return checkers, check_mask, pins
+
+    # ---------- MOVE GENERATION ----------
+    def generate_moves(self, captures_only=False):
+        """Return the legal moves for the side to move.
+
+        Non-king moves are filtered against the check and pin masks; only king
+        moves and en-passant (which can expose a rank pin) are played out.
+        With `captures_only`, quiet moves are dropped (promotions are kept).
+        The full list is cached until the next make / unmake.
+        """
+        color = self.turn
+        cached = self._legal_cache
+        if cached is not None and cached[0] == color:
+            if captures_only:
+                return [m for m in cached[1] if self.is_tactical(m)]
+            return list(cached[1])
+        checks = self.pins_and_checks(color)
+        out = []
+        for move in self.generate_pseudo_moves():
+            if captures_only and not self.is_tactical(move):
+                continue
+            if self._is_legal(move, color, checks):
+                out.append(move)
+        if not captures_only:
+            self._legal_cache = (color, out)
+            return list(out)
+        return out
+
+    def _is_legal(self, move, color, checks):
+        """Legality of a pseudo-legal move, given `pins_and_checks(color)`."""
+        if move.piece.type == PieceType.KING or move.en_passant:
+            undo = self.make_move(move)
+            legal = not self.is_in_check(color)
+            self.unmake_move(undo)
+            return legal
+        checkers, check_mask, pins = checks
+        if checkers > 1:
+            return False
+        if checkers and move.to not in check_mask:
+            return False
+        pin = pins.get(move.frm)
+        if pin:
+            # A pinned piece may only slide along the pin line
+            dx, dy = pin
+            mx, my = move.to[0] - move.frm[0], move.to[1] - move.frm[1]
+            if mx * dy != my * dx:
+                return False
+        return True
+
+    def is_tactical(self, move):
+        """Capture (including en-passant) or promotion."""
+        return bool(move.promotion or move.en_passant or self.grid[move.to[1]][move.to[0]])
+
+    def iter_moves(self, staged=True):
+        """Yield the legal moves one at a time instead of building the whole list.
+
+        With `staged`, captures and promotions come first and quiet moves are
+        held back until every piece has been scanned; otherwise moves come out
+        in generation order, which is the cheapest way to find *a* legal move.
+        The caller may make a yielded move but must unmake it before asking
+        for the next one.
+        """
+        color = self.turn
+        cached = self._legal_cache
+        if cached is not None and cached[0] == color:
+            moves = cached[1]
+            if staged:
+                moves = [m for m in moves if self.is_tactical(m)] + [m for m in moves if not self.is_tactical(m)]
+            yield from moves
+            return
+        checks = self.pins_and_checks(color)
+        quiets = []
+        # make/unmake (king moves, en-passant) touch piece_lists, so iterate a snapshot
+        for pos, p in list(self.piece_lists[color].items()):
+            for move in self.generate_piece_moves(pos, p):
+                if not self._is_legal(move, color, checks):
+                    continue
+                if staged and not self.is_tactical(move):
+                    quiets.append(move)
+                    continue
+                yield move
+        yield from quiets
+
+    def has_legal_move(self) -> bool:
+        """True if the side to move has a legal move; stops at the first one found."""
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.turn:
+            return bool(cached[1])
+        return next(self.iter_moves(staged=False), None) is not None
+
+    def generate_pseudo_moves(self):
+        """Moves that obey piece movement but may leave the own king in check."""
+        out = []
+        for pos, p in self.piece_lists[self.turn].items():
+            out.extend(self.generate_piece_moves(pos, p))
+        return out
+
+    def generate_captures(self):
+        """Legal captures and promotions only (for quiescence search)."""
+        return self.generate_moves(captures_only=True)
+
     def generate_next_states(self):
         out = []
-        for y in range(8):
-            for x in range(8):
-                p = self.grid[y][x]
-                if p and p.color == self.turn:
-                    out.extend(self.generate_piece_next_states((x, y), p))
+        for move in self.generate_moves():
+            newb = self.copy()
+            newb.make_move(move)
+            out.append(NextState(board=newb, move=move))
         return out
 
+    def iter_next_states(self, staged=True):
+        """Lazy `generate_next_states`: each child board is built only when requested."""
+        for move in self.iter_moves(staged):
+            newb = self.copy()
+            newb.make_move(move)
+            yield NextState(board=newb, move=move)
+
     # ---------- MOVE AVAILABILITY / GAME END ----------
     def _has_legal_moves_for(self, color: Color) -> bool:
         """Return True if `color` has at least one legal move from current position."""
         cur_turn = self.turn
         try:
             self.turn = color
-            nexts = self.generate_next_states()
-            return len(nexts) > 0
+            return self.has_legal_move()
         finally:
             self.turn = cur_turn
 
+    def status(self) -> GameStatus:
+        """State of the game for the side to move.
+
+        Generates the legal moves once; a following `generate_moves` call
+        reuses them from the cache.
+        """
+        if self.generate_moves():
+            if self.halfmove_clock >= FIFTY_MOVE_PLIES or self.insufficient_material():
+                return GameStatus.DRAW
+            return GameStatus.ONGOING
+        if self.is_in_check(self.turn):
+            return GameStatus.CHECKMATE
+        return GameStatus.STALEMATE
+
+    def insufficient_material(self) -> bool:
+        """True if neither side can mate: bare kings, or king and one minor piece against king."""
+        minors = 0
+        for color in (Color.WHITE, Color.BLACK):
+            for p in self.piece_lists[color].values():
+                if p.type in (PieceType.KNIGHT, PieceType.BISHOP):
+                    minors += 1
+                elif p.type != PieceType.KING:
+                    return False
+        return minors <= 1
+
     def is_checkmate(self, color: Color) -> bool:
         """True if `color` is checkmated (in check and no legal moves)."""
         if not self.is_in_check(color):
@@ -170,7 +681,74 @@ class Board:
             return False
         return not self._has_legal_moves_for(color)
 
-    def generate_piece_next_states(self, pos, piece):
+    # ---------- NOTATION (SAN / UCI) ----------
+    def san(self, move: Move) -> str:
+        """Standard algebraic notation of a legal `move`, e.g. "Nbd7", "exd6", "e8=Q+", "O-O"."""
+        if move.castling:
+            out = "O-O" if move.to[0] == 6 else "O-O-O"
+        else:
+            piece = move.piece
+            capture = move.en_passant or self.get(move.to) is not None
+            if piece.type == PieceType.PAWN:
+                out = "abcdefgh"[move.frm[0]] + "x" if capture else ""
+            else:
+                out = FEN_LETTERS[piece.type].upper()
+                rivals = [m.frm for m in self.generate_moves()
+                          if m.piece.type == piece.type and m.to == move.to and m.frm != move.frm]
+                if rivals:
+                    if all(frm[0] != move.frm[0] for frm in rivals):
+                        out += "abcdefgh"[move.frm[0]]
+                    elif all(frm[1] != move.frm[1] for frm in rivals):
+                        out += str(8 - move.frm[1])
+                    else:
+                        out += square_name(move.frm)
+                if capture:
+                    out += "x"
+            out += square_name(move.to)
+            if move.promotion:
+                out += "=" + PROMOTION_LETTERS[move.promotion].upper()
+        undo = self.make_move(move)
+        if self.is_in_check(self.turn):
+            out += "+" if self.has_legal_move() else "#"
+        self.unmake_move(undo)
+        return out
+
+    def parse_san(self, san: str) -> Move:
+        """Legal move written in SAN (check marks, annotations and "=" are optional)."""
+        text = san.strip().rstrip("+#!?").replace("0", "O")
+        if text.endswith("e.p."):
+            text = text[:-4].rstrip()
+        moves = self.generate_moves()
+        if text in ("O-O", "O-O-O"):
+            x = 6 if text == "O-O" else 2
+            found = [m for m in moves if m.castling and m.to[0] == x]
+        else:
+            match = SAN_PATTERN.match(text)
+            if not match:
+                raise ValueError(f"Invalid SAN move: {san!r}")
+            piece, file, rank, to, promo = match.groups()
+            ptype = SAN_PIECES[piece] if piece else PieceType.PAWN
+            to = (ord(to[0]) - ord("a"), 8 - int(to[1]))
+            promotion = SAN_PIECES[promo.upper()] if promo else None
+            found = [
+                m for m in moves
+                if m.piece.type == ptype and m.to == to and m.promotion == promotion
+                and (file is None or m.frm[0] == ord(file) - ord("a"))
+                and (rank is None or m.frm[1] == 8 - int(rank))
+            ]
+        if len(found) != 1:
+            problem = "Illegal" if not found else "Ambiguous"
+            raise ValueError(f"{problem} SAN move {san!r} in {self.to_fen()}")
+        return found[0]
+
+    def parse_uci(self, uci: str) -> Move:
+        """Legal move written in UCI long algebraic form, e.g. "e2e4", "e7e8q"."""
+        for move in self.generate_moves():
+            if move.uci() == uci:
+                return move
+        raise ValueError(f"Illegal UCI move {uci!r} in {self.to_fen()}")
+
+    def generate_piece_moves(self, pos, piece):
         if piece.type == PieceType.PAWN:
             return self.generate_pawn(pos, piece)
         if piece.type == PieceType.KNIGHT:
@@ -194,37 +772,7 @@ class Board:
             while self.inside(nx, ny):
                 t = self.get((nx, ny))
                 if t is None or t.color != piece.color:
-                    newb = self.copy()
-                    newb.grid[y][x] = None
-                    newb.grid[ny][nx] = piece.copy()
-                    # Update castling rights
-                    if piece.type == PieceType.ROOK:
-                        if piece.color == Color.WHITE:
-                            if (x, y) == (7, 7):
-                                newb.castling[Color.WHITE]['K'] = False
-                            if (x, y) == (0, 7):
-                                newb.castling[Color.WHITE]['Q'] = False
-                        else:
-                            if (x, y) == (7, 0):
-                                newb.castling[Color.BLACK]['K'] = False
-                            if (x, y) == (0, 0):
-                                newb.castling[Color.BLACK]['Q'] = False
-                    # Update rook capture castling rights
-                    if t and t.type == PieceType.ROOK:
-                        if t.color == Color.WHITE:
-                            if (nx, ny) == (7, 7):
-                                newb.castling[Color.WHITE]['K'] = False
-                            if (nx, ny) == (0, 7):
-                                newb.castling[Color.WHITE]['Q'] = False
-                        else:
-                            if (nx, ny) == (7, 0):
-                                newb.castling[Color.BLACK]['K'] = False
-                            if (nx, ny) == (0, 0):
-                                newb.castling[Color.BLACK]['Q'] = False
-                    newb.turn = self.turn.opposite()
-                    newb.en_passant = None
-                    if not newb.is_in_check(piece.color):
-                        out.append(NextState(board=newb, move=Move(frm=(x, y), to=(nx, ny), piece=piece)))
+                    out.append(Move(frm=(x, y), to=(nx, ny), piece=piece))
                     if t:
                         break
                 else:
@@ -243,13 +791,7 @@ class Board:
             if self.inside(nx, ny):
                 t = self.get((nx, ny))
                 if t is None or t.color != piece.color:
-                    newb = self.copy()
-                    newb.grid[y][x] = None
-                    newb.grid[ny][nx] = piece.copy()
-                    newb.turn = self.turn.opposite()
-                    newb.en_passant = None
-                    if not newb.is_in_check(piece.color):
-                        out.append(NextState(board=newb, move=Move(frm=(x, y), to=(nx, ny), piece=piece)))
+                    out.append(Move(frm=(x, y), to=(nx, ny), piece=piece))
         return out
 
     # ---------- PAWN ----------
@@ -263,9 +805,9 @@ class Board:
         if self.inside(x, y+dirp) and self.get((x, y+dirp)) is None:
             out.extend(self._pawn_move(pos, (x, y+dirp), piece))
 
-        # forward 2
-        if y == start_row and self.get((x, y+dirp)) is None and self.get((x, y+2*dirp)) is None:
-            out.extend(self._pawn_move(pos, (x, y+2*dirp), piece, double=True))
+            # forward 2
+            if y == start_row and self.get((x, y+2*dirp)) is None:
+                out.extend(self._pawn_move(pos, (x, y+2*dirp), piece))
         # capture
         for dx in (-1, 1):
             nx, ny = x + dx, y + dirp
@@ -282,40 +824,11 @@ class Board:
 
         return out
 
-    def _pawn_move(self, frm, to, piece, double=False, enpass=False):
-        fx, fy = frm
-        tx, ty = to
+    def _pawn_move(self, frm, to, piece, enpass=False):
+        ty = to[1]
         if (piece.color == Color.WHITE and ty == 0) or (piece.color == Color.BLACK and ty == 7):
-            out = []
-            for t in [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT]:
-                newb = self.copy()
-                newb.grid[fy][fx] = None
-                newb.grid[ty][tx] = Piece(t, piece.color)
-                newb.turn = self.turn.opposite()
-                newb.en_passant = None
-                if not newb.is_in_check(piece.color):
-                    out.append(NextState(board=newb, move=Move(frm=frm, to=to, piece=piece, promotion=t)))
-            return out
-                       
-        newb = self.copy()
-        newb.grid[fy][fx] = None
-
-        if enpass:
-            direction = -1 if piece.color == Color.WHITE else 1
-            newb.grid[ty - direction][tx] = None
-
-        newb.grid[ty][tx] = piece.copy()
-
-        if double:
-            mid = (fy + ty)//2
-            newb.en_passant = (fx, mid)
-        else:
-            newb.en_passant = None
-
-        newb.turn = self.turn.opposite()
-        if newb.is_in_check(piece.color):
-            return []
-        return [NextState(board=newb, move=Move(frm=frm, to=to, piece=piece, en_passant=enpass))]
+            return [Move(frm=frm, to=to, piece=piece, promotion=t) for t in PROMOTION_TYPES]
+        return [Move(frm=frm, to=to, piece=piece, en_passant=enpass)]
 
     # ---------- KING ----------
     def generate_king(self, pos, piece):
@@ -328,15 +841,7 @@ class Board:
             if self.inside(nx, ny):
                 t = self.get((nx, ny))
                 if t is None or t.color != piece.color:
-                    newb = self.copy()
-                    newb.grid[y][x] = None
-                    newb.grid[ny][nx] = piece.copy()
-                    newb.castling[piece.color]["K"] = False
-                    newb.castling[piece.color]["Q"] = False
-                    newb.turn = self.turn.opposite()
-                    newb.en_passant = None
-                    if not newb.is_in_check(piece.color):
-                        out.append(NextState(board=newb, move=Move(frm=(x, y), to=(nx, ny), piece=piece)))
+                    out.append(Move(frm=(x, y), to=(nx, ny), piece=piece))
 
         # castling
         out.extend(self._castle(pos, piece))
@@ -349,39 +854,14 @@ class Board:
         rights = self.castling[king.color]
         enemy = king.color.opposite()
 
-        
         if rights["K"]:
             if self.grid[y][5] is None and self.grid[y][6] is None and self.grid[y][7] is not None:
                 if not self.square_attacked((4,y), enemy) and not self.square_attacked((5,y), enemy) and not self.square_attacked((6,y), enemy):
-                    newb = self.copy()
-                    newb.grid[y][4] = None
-                    newb.grid[y][6] = king.copy()
-                    
-                    rook = newb.grid[y][7]
-                    if rook is not None: 
-                        newb.grid[y][7] = None
-                        newb.grid[y][5] = rook.copy()
-                        newb.turn = enemy
-                        newb.castling[king.color]["K"] = False
-                        newb.castling[king.color]["Q"] = False
-                        newb.en_passant = None
-                        out.append(NextState(board=newb, move=Move(frm=(x, y), to=(6, y), piece=king, castling=True)))
+                    out.append(Move(frm=(x, y), to=(6, y), piece=king, castling=True))
 
         if rights["Q"]:
             if self.grid[y][1] is None and self.grid[y][2] is None and self.grid[y][3] is None and self.grid[y][0] is not None:
                 if not self.square_attacked((4,y), enemy) and not self.square_attacked((3,y), enemy) and not self.square_attacked((2,y), enemy):
-                    newb = self.copy()
-                    newb.grid[y][4] = None
-                    newb.grid[y][2] = king.copy()
-                    
-                    rook = newb.grid[y][0]
-                    if rook is not None:
-                        newb.grid[y][0] = None
-                        newb.grid[y][3] = rook.copy()
-                        newb.turn = enemy
-                        newb.castling[king.color]["K"] = False
-                        newb.castling[king.color]["Q"] = False
-                        newb.en_passant = None
-                        out.append(NextState(board=newb, move=Move(frm=(x, y), to=(2, y), piece=king, castling=True)))
+                    out.append(Move(frm=(x, y), to=(2, y), piece=king, castling=True))
 
         return out
@@ -0,0 +1,48 @@
+"""EPD (Extended Position Description) reading.
+
+An EPD record is the first four FEN fields followed by `opcode operands;`
+operations, e.g.
+
+    r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - bm Qxf7#; id "scholar";
+"""
+import shlex
+
+from .board import Board
+
+def parse_epd(line: str):
+    """Parse one EPD record into `(board, ops)`, where `ops` maps opcode -> list of operands."""
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"Invalid EPD record: {line!r}")
+    rest = fields[4] if len(fields) > 4 else ""
+    ops = {}
+    for op in rest.split(";"):
+        tokens = shlex.split(op)
+        if tokens:
+            ops[tokens[0]] = tokens[1:]
+    # hmvc / fmvn are the EPD spelling of the FEN move clocks
+    clocks = [ops.get("hmvc", ["0"])[0], ops.get("fmvn", ["1"])[0]]
+    board = Board.from_fen(" ".join(fields[:4] + clocks))
+    return board, ops
+
+def read_epd(path):
+    """All records of an EPD file as `(board, ops)` pairs; blank lines and `#` comments are skipped."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                records.append(parse_epd(line))
+    return records
+
+# Opcodes whose operand is a quoted string
+STRING_OPCODES = {"id", "c0", "c1", "c2", "c3", "c4", "c5", "c6", "c7", "c8", "c9"}
+
+def to_epd(board: Board, ops=None) -> str:
+    """EPD record of `board` with the given `{opcode: [operands]}`."""
+    out = " ".join(board.to_fen().split()[:4])
+    for opcode, operands in (ops or {}).items():
+        if opcode in STRING_OPCODES:
+            operands = [f'"{o}"' for o in operands]
+        out += " " + " ".join([opcode] + list(operands)) + ";"
+    return out
@@ -1,7 +1,21 @@
 from typing import Optional
 from .piece import Piece, PieceType
 
+PROMOTION_LETTERS = {
+    PieceType.QUEEN: "q",
+    PieceType.ROOK: "r",
+    PieceType.BISHOP: "b",
+    PieceType.KNIGHT: "n",
+}
+
+def square_name(pos: tuple[int, int]) -> str:
+    """(x, y) grid coordinates -> algebraic square, e.g. (4, 6) -> "e2"."""
+    x, y = pos
+    return "abcdefgh"[x] + str(8 - y)
+
 class Move:
+    __slots__ = ("frm", "to", "piece", "promotion", "en_passant", "castling")
+
     def __init__(
         self,
         frm: tuple[int, int],
@@ -18,6 +32,24 @@ class Move:
         self.en_passant: bool = en_passant
         self.castling: bool = castling
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self.frm == other.frm and self.to == other.to and self.promotion == other.promotion
+
+    def __hash__(self) -> int:
+        return hash((self.frm, self.to, self.promotion))
+
+    def pack(self) -> int:
+        return pack_move(self)
+
+    def uci(self) -> str:
+        """Long algebraic (UCI) form, e.g. "e2e4" or "e7e8q"."""
+        s = square_name(self.frm) + square_name(self.to)
+        if self.promotion:
+            s += PROMOTION_LETTERS[self.promotion]
+        return s
+
     def __repr__(self) -> str:
         s = f"{self.piece}{self.frm}->{self.to}"
         if self.promotion:
@@ -27,3 +59,90 @@ class Move:
         if self.en_passant:
             s += " (ep)"
         return s
+
+
+# ---------- COMPACT (16-bit) MOVES ----------
+# bits 0-5: from square, 6-11: to square (y * 8 + x), 12-15: kind
+NORMAL, EN_PASSANT, CASTLING = 0, 1, 2
+PROMOTION_KINDS = {PieceType.KNIGHT: 4, PieceType.BISHOP: 5, PieceType.ROOK: 6, PieceType.QUEEN: 7}
+KIND_PROMOTIONS = {kind: t for t, kind in PROMOTION_KINDS.items()}
+
+def pack_move(move: Optional[Move]) -> int:
+    """Encode a move into 16 bits. 0 (a8 -> a8) is never a real move and stands for "no move"."""
+    if move is None:
+        return 0
+    fx, fy = move.frm
+    tx, ty = move.to
+    if move.promotion:
+        kind = PROMOTION_KINDS[move.promotion]
+    elif move.en_passant:
+        kind = EN_PASSANT
+    elif move.castling:
+        kind = CASTLING
+    else:
+        kind = NORMAL
+    return (fy * 8 + fx) | (ty * 8 + tx) << 6 | kind << 12
+
+class CompactMove:
+    """Read-only view over a packed move code.
+
+    Compares equal to the `Move` it was packed from, so it can be looked up
+    in generated move lists; `to_move` rebuilds a full `Move`.
+    """
+    __slots__ = ("code",)
+
+    def __init__(self, code: int) -> None:
+        self.code = code
+
+    @classmethod
+    def from_move(cls, move: Move) -> "CompactMove":
+        return cls(pack_move(move))
+
+    @property
+    def frm(self) -> tuple[int, int]:
+        sq = self.code & 63
+        return (sq % 8, sq // 8)
+
+    @property
+    def to(self) -> tuple[int, int]:
+        sq = (self.code >> 6) & 63
+        return (sq % 8, sq // 8)
+
+    @property
+    def promotion(self) -> Optional[PieceType]:
+        return KIND_PROMOTIONS.get(self.code >> 12)
+
+    @property
+    def en_passant(self) -> bool:
+        return self.code >> 12 == EN_PASSANT
+
+    @property
+    def castling(self) -> bool:
+        return self.code >> 12 == CASTLING
+
+    def to_move(self, piece: Optional[Piece] = None) -> Move:
+        """Full `Move`; pass the moving piece (e.g. `board.get(cm.frm)`) if it is needed."""
+        return Move(self.frm, self.to, piece, self.promotion, self.en_passant, self.castling)
+
+    def uci(self) -> str:
+        s = square_name(self.frm) + square_name(self.to)
+        if self.promotion:
+            s += PROMOTION_LETTERS[self.promotion]
+        return s
+
+    def __int__(self) -> int:
+        return self.code
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactMove):
+            return self.code == other.code
+        if isinstance(other, Move):
+            return self.code == pack_move(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Same hash as the equal `Move`
+        return hash((self.frm, self.to, self.promotion))
+
+    def __repr__(self) -> str:
+        return f"CompactMove({self.uci()})"
@@ -0,0 +1,112 @@
+"""Perft: count leaf nodes of the legal move tree to validate and time move generation.
+
+    python -m state.perft                      # all standard positions, default depths
+    python -m state.perft --position kiwipete --depth 4
+    python -m state.perft --fen "<fen>" --depth 3 --divide
+    python -m state.perft --backend bitboard
+"""
+import argparse
+import sys
+import time
+
+from .board import Board
+from .bitboard import BitBoard
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# (name, FEN, known node counts for depth 1, 2, ..., default depth)
+# Reference counts from https://www.chessprogramming.org/Perft_Results
+PERFT_POSITIONS = [
+    ("startpos", START_FEN,
+     [20, 400, 8902, 197281, 4865609], 4),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603], 3),
+    # En-passant captures that expose the king along a rank
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624], 4),
+    # Promotions (with capture), castling through and out of attacks
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333], 3),
+    ("position4-mirrored", "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     [6, 264, 9467, 422333], 3),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487], 3),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594], 3),
+]
+
+BACKENDS = {
+    "board": Board.from_fen,
+    "bitboard": BitBoard.from_fen,
+}
+
+def perft(board, depth):
+    """Number of leaf nodes `depth` plies below `board` (the board is left unchanged)."""
+    if depth == 0:
+        return 1
+    moves = board.generate_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+def divide(board, depth):
+    """Perft split by root move: {uci move: leaf count}."""
+    out = {}
+    for move in board.generate_moves():
+        undo = board.make_move(move)
+        out[move.uci()] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return out
+
+def run_position(name, fen, depth, expected=None, backend="board", show_divide=False):
+    """Run perft on one position and print a result line. Returns True if the count matches."""
+    board = BACKENDS[backend](fen)
+    start = time.perf_counter()
+    if show_divide:
+        split = divide(board, depth)
+        for move in sorted(split):
+            print(f"  {move}: {split[move]}")
+        nodes = sum(split.values())
+    else:
+        nodes = perft(board, depth)
+    elapsed = time.perf_counter() - start
+    nps = nodes / elapsed if elapsed > 0 else float("inf")
+
+    if expected is None:
+        status = "----"
+        ok = True
+    else:
+        ok = nodes == expected
+        status = "OK  " if ok else f"FAIL (expected {expected})"
+    print(f"{name:<20} depth {depth}  nodes {nodes:>10}  {elapsed:8.2f}s  {nps:>10.0f} nps  {status}")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft move-generation check and benchmark")
+    parser.add_argument("--depth", type=int, help="search depth (default: per-position default)")
+    parser.add_argument("--position", choices=[p[0] for p in PERFT_POSITIONS], help="run only this standard position")
+    parser.add_argument("--fen", help="run a custom FEN instead of the standard positions")
+    parser.add_argument("--divide", action="store_true", help="print the node count per root move")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="board")
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        run_position("custom", args.fen, args.depth or 3, backend=args.backend, show_divide=args.divide)
+        return 0
+
+    all_ok = True
+    for name, fen, counts, default_depth in PERFT_POSITIONS:
+        if args.position and name != args.position:
+            continue
+        depth = args.depth or default_depth
+        expected = counts[depth - 1] if depth <= len(counts) else None
+        all_ok &= run_position(name, fen, depth, expected, args.backend, args.divide)
+    return 0 if all_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,15 +15,60 @@ class PieceType(Enum):
     QUEEN  = "QUEEN"
     KING   = "KING"
 
+# Material in pawn units (Board.material); the king is never captured so it counts 0.
+# Not to be confused with state.pst.PIECE_VALUES (centipawns, used by the search)
+MATERIAL_VALUES = {
+    PieceType.PAWN: 1,
+    PieceType.KNIGHT: 3,
+    PieceType.BISHOP: 3,
+    PieceType.ROOK: 5,
+    PieceType.QUEEN: 9,
+    PieceType.KING: 0
+}
+
 class Piece:
-    def __init__(self, piece_type: PieceType, color: Color):
-        self.type = piece_type
-        self.color = color
+    """A (type, color) pair. There are exactly 12 instances: `Piece(type, color)`
+    returns the shared one, so pieces are immutable, compare by identity and can
+    be shared freely between boards, copies and processes."""
+    __slots__ = ("type", "color")
+
+    def __new__(cls, piece_type: PieceType, color: Color):
+        try:
+            return _PIECES[(piece_type, color)]
+        except KeyError:
+            raise ValueError(f"Invalid piece: {piece_type!r}, {color!r}") from None
+
+    @classmethod
+    def _intern(cls, piece_type, color):
+        piece = object.__new__(cls)
+        object.__setattr__(piece, "type", piece_type)
+        object.__setattr__(piece, "color", color)
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Piece is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Piece is immutable")
 
     def __repr__(self):
         return f"{self.color.name}_{self.type.name}"
 
+    # Sao chep / pickle deu tra ve dung instance dung chung
     def copy(self):
-        """Return a shallow copy of this Piece (same type and color)."""
-        return Piece(self.type, self.color)
-      
\ No newline at end of file
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Piece, (self.type, self.color))
+
+_PIECES = {
+    (t, c): Piece._intern(t, c)
+    for c in (Color.WHITE, Color.BLACK)
+    for t in PieceType
+}
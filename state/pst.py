@@ -0,0 +1,112 @@
+"""Material + piece-square tables used by Minimaxbot, plus flat per-square
+lookups that `Board` sums incrementally as pieces are placed and removed."""
+from .piece import PieceType, Color
+
+#-- BANG DIEM UU TIEN
+
+PIECE_VALUES = {            #Tot 1, Ma 3, Tuong 3, Xe 5, Hau 9
+    PieceType.PAWN: 100, # Quan Tot
+    PieceType.KNIGHT: 300, #Quan Ma
+    PieceType.BISHOP: 350, #Quan Tuong (uu tien hon Ma)
+    PieceType.ROOK: 500,    #Quan Xe
+    PieceType.QUEEN: 900,   #Quan Hau
+    PieceType.KING: 20000   #Quan Tuong
+}
+
+#-- MA TRAN DIEM O TUNG VI TRI
+
+# Quan Tot - tien len, kiem soat trung tam
+PAWN_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [10, 10, 20, 30, 30, 20, 10, 10],
+    [5,  5, 10, 25, 25, 10,  5,  5],
+    [0,  0,  0, 20, 20,  0,  0,  0],
+    [5, -5,-10,  0,  0,-10, -5,  5],
+    [5, 10, 10,-20,-20, 10, 10,  5],
+    [0,  0,  0,  0,  0,  0,  0,  0]
+]
+
+# Quan Ma - tranh o bien
+KNIGHT_TABLE = [
+    [-50,-40,-30,-30,-30,-30,-40,-50],
+    [-40,-20,  0,  0,  0,  0,-20,-40],
+    [-30,  0, 10, 15, 15, 10,  0,-30],
+    [-30,  5, 15, 20, 20, 15,  5,-30],
+    [-30,  0, 15, 20, 20, 15,  0,-30],
+    [-30,  5, 10, 15, 15, 10,  5,-30],
+    [-40,-20,  0,  5,  5,  0,-20,-40],
+    [-50,-40,-30,-30,-30,-30,-40,-50]
+]
+
+# Quan Tuong tranh bien, di o trung tam
+BISHOP_TABLE = [
+    [-20,-10,-10,-10,-10,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5, 10, 10,  5,  0,-10],
+    [-10,  5,  5, 10, 10,  5,  5,-10],
+    [-10,  0, 10, 10, 10, 10,  0,-10],
+    [-10, 10, 10, 10, 10, 10, 10,-10],
+    [-10,  5,  0,  0,  0,  0,  5,-10],
+    [-20,-10,-10,-10,-10,-10,-10,-20]
+]
+
+# Xe: thich hang ngang, o hàng 7
+ROOK_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [5, 10, 10, 10, 10, 10, 10,  5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [0,  0,  0,  5,  5,  0,  0,  0]
+]
+
+# Quan Hau - Tranh o bien
+QUEEN_TABLE = [
+    [-20,-10,-10, -5, -5,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5,  5,  5,  5,  0,-10],
+    [-5,   0,  5,  5,  5,  5,  0, -5],
+    [0,    0,  5,  5,  5,  5,  0, -5],
+    [-10,  5,  5,  5,  5,  5,  0,-10],
+    [-10,  0,  5,  0,  0,  0,  0,-10],
+    [-20,-10,-10, -5, -5,-10,-10,-20]
+]
+
+# Quan Vua - han che di chuyen xa
+KING_MID_TABLE = [
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-20,-30,-30,-40,-40,-30,-30,-20],
+    [-10,-20,-20,-20,-20,-20,-20,-10],
+    [20, 20,  0,  0,  0,  0, 20, 20],
+    [20, 30, 10,  0,  0, 10, 30, 20]
+]
+
+_TABLES = {
+    PieceType.PAWN: PAWN_TABLE,
+    PieceType.KNIGHT: KNIGHT_TABLE,
+    PieceType.BISHOP: BISHOP_TABLE,
+    PieceType.ROOK: ROOK_TABLE,
+    PieceType.QUEEN: QUEEN_TABLE,
+    PieceType.KING: KING_MID_TABLE,
+}
+
+def _flat(piece_type, color):
+    # Diem (vat chat + vi tri) theo o y * 8 + x; quan Den lat bang va mang dau am
+    table = _TABLES[piece_type]
+    value = PIECE_VALUES[piece_type]
+    if color == Color.WHITE:
+        return [value + table[sq // 8][sq % 8] for sq in range(64)]
+    return [-(value + table[7 - sq // 8][sq % 8]) for sq in range(64)]
+
+# PIECE_SQUARE[(type, color)][y * 8 + x]: dong gop vao diem Trang - Den
+PIECE_SQUARE = {
+    (t, c): _flat(t, c)
+    for c in (Color.WHITE, Color.BLACK)
+    for t in PieceType
+}
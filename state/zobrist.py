@@ -0,0 +1,31 @@
+"""Zobrist keys for `Board.hash`.
+
+The keys come from a fixed seed so every process (and every run) agrees on
+the hash of a position, which lets hashes be shared between workers or saved.
+"""
+import random
+
+from .piece import PieceType, Color
+
+_rng = random.Random(0x5EED_C4E55)
+
+def _key():
+    return _rng.getrandbits(64)
+
+# PIECE_KEYS[(type, color)][y * 8 + x]
+PIECE_KEYS = {
+    (t, c): [_key() for _ in range(64)]
+    for c in (Color.WHITE, Color.BLACK)
+    for t in PieceType
+}
+
+CASTLING_KEYS = {
+    Color.WHITE: {"K": _key(), "Q": _key()},
+    Color.BLACK: {"K": _key(), "Q": _key()},
+}
+
+# Indexed by the file (x) of the en-passant square
+EN_PASSANT_KEYS = [_key() for _ in range(8)]
+
+# XOR-ed in when black is to move
+SIDE_KEY = _key()
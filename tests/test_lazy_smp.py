@@ -0,0 +1,47 @@
+import gc
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from bot.minimax_bot import Minimaxbot
+from state.board import Board
+
+
+def _positions(count, seed=7):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        for _ in range(rng.randint(4, 30)):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+        if board.generate_moves():
+            positions.append(board)
+    return positions
+
+
+def test_lazy_smp_repeated_searches_do_not_raise():
+    # Helpers get the root position while the main process is already searching it
+    bot = Minimaxbot(depth=2, workers=3, parallel="lazy_smp", tt_size_mb=1)
+    try:
+        for board in _positions(40):
+            fen = board.to_fen()
+            result = bot.choose_move(board)
+            assert result.move in board.generate_moves()
+            assert board.to_fen() == fen
+    finally:
+        bot.close()
+
+
+def test_lazy_smp_table_is_created_lazily_and_freed_without_close():
+    bot = Minimaxbot(depth=2, workers=2, parallel="lazy_smp", tt_size_mb=1)
+    assert bot.tt is None
+    bot.choose_move(Board())
+    name = bot.tt.name
+    del bot
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,32 @@
+import pytest
+
+from state.perft import PERFT_POSITIONS, BACKENDS, perft
+
+# (position, depth): shallow enough to run on every test pass
+CASES = [
+    ("startpos", 3),
+    ("kiwipete", 2),
+    ("position3", 3),
+    ("position4", 2),
+    ("position4-mirrored", 2),
+    ("position5", 2),
+    ("position6", 2),
+]
+
+POSITIONS = {name: (fen, counts) for name, fen, counts, _ in PERFT_POSITIONS}
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("name,depth", CASES)
+def test_perft_matches_published_counts(backend, name, depth):
+    fen, counts = POSITIONS[name]
+    board = BACKENDS[backend](fen)
+    before = board.hash
+    assert perft(board, depth) == counts[depth - 1]
+    assert board.hash == before
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_kiwipete_depth_3(backend):
+    fen, counts = POSITIONS["kiwipete"]
+    assert perft(BACKENDS[backend](fen), 3) == counts[2]